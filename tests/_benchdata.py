@@ -0,0 +1,60 @@
+"""
+Synthetic Steam files for the bench_*.py scripts.
+
+The trees are generated from a fixed seed, so every run measures the same data.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+import vdf
+
+VALUES = ['1', '0', 'some value here', '76561198000000000', 'C:\\\\path\\\\to', 'http://cdn.example']
+
+
+def _config_block(rng, depth, count, out):
+    indent = '\t' * depth
+    for i in range(count):
+        if depth < 5 and rng.random() < 0.15:
+            out.append('%s"Block%d"\n%s{\n' % (indent, i, indent))
+            _config_block(rng, depth + 1, rng.randint(1, 12), out)
+            out.append('%s}\n' % indent)
+        else:
+            out.append('%s"Key%d"\t\t"%s"\n' % (indent, i, rng.choice(VALUES)))
+
+
+def config_text(entries=20000, seed=1):
+    """config.vdf-shaped text, about 2.4MB with the default ``entries``."""
+    out = ['"InstallConfigStore"\n{\n']
+    _config_block(random.Random(seed), 1, entries, out)
+    out.append('}\n')
+    return ''.join(out)
+
+
+def appinfo_tree(apps=20000):
+    """appinfo.vdf-shaped tree, with typed ints and floats for the binary format."""
+    return {'appinfo': dict(
+        (str(i), {'common': {
+            'name': 'Game %d' % i,
+            'type': 'game',
+            'id': vdf.UINT_64(i),
+            'f': 1.5,
+            'n': i,
+            'nested': dict(('k%d' % j, 'v' * 30) for j in range(10)),
+        }}) for i in range(apps)
+    )}
+
+
+def best_of(fn, repeat=5):
+    """Best wall time of ``repeat`` runs, in seconds."""
+    import time
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,45 @@
+"""
+Memory and time of parsing with vdf.CompactDict against plain dicts, measured
+with tracemalloc. Uses the synthetic 2.4MB config.vdf and an appinfo-style
+binary file from tests/_benchdata.py.
+
+    python tests/bench_compact.py
+"""
+import gc
+import io
+import tracemalloc
+
+from _benchdata import appinfo_tree, best_of, config_text, vdf
+
+
+def measure(fn):
+    """(retained bytes, peak bytes, best time) of building a tree with ``fn``."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, best_of(fn, repeat=3)
+
+
+def main():
+    text = config_text()
+    binary = vdf.binary_dumps(appinfo_tree())
+    print('config.vdf %.1fMB, appinfo %.1fMB' % (len(text) / 1e6, len(binary) / 1e6))
+
+    cases = (
+        # loads() used to copy the string into a StringIO and parse it from there
+        ('config.vdf parse(StringIO)', lambda: vdf.parse(io.StringIO(text))),
+        ('config.vdf loads, dict', lambda: vdf.loads(text)),
+        ('config.vdf loads, CompactDict', lambda: vdf.loads(text, mapper=vdf.CompactDict)),
+        ('appinfo binary_loads, dict', lambda: vdf.binary_loads(binary)),
+        ('appinfo binary_loads, CompactDict', lambda: vdf.binary_loads(binary, mapper=vdf.CompactDict)),
+    )
+    for label, fn in cases:
+        retained, peak, elapsed = measure(fn)
+        print('%-34s retained %6.1fMB  peak %6.1fMB  %.3fs' % (label, retained / 1e6, peak / 1e6, elapsed))
+
+
+if __name__ == '__main__':
+    main()
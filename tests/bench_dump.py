@@ -0,0 +1,80 @@
+"""
+Benchmark of vdf.dumps / vdf.dump against the recursive generator they
+replaced, on a synthetic 2.4MB config.vdf. Also checks that the output is the
+same and counts the write() calls made by dump().
+
+    python tests/bench_dump.py
+"""
+import io
+
+from _benchdata import best_of, config_text, vdf
+from bench_escape import old_escape
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+def old_dump_gen(data, pretty=False, escaped=True, level=0):
+    line_indent = '\t' * level if pretty else ''
+
+    for key, value in data.items():
+        if escaped and isinstance(key, str):
+            key = old_escape(key)
+
+        if isinstance(value, Mapping):
+            yield '%s"%s"\n%s{\n' % (line_indent, key, line_indent)
+            for chunk in old_dump_gen(value, pretty, escaped, level + 1):
+                yield chunk
+            yield '%s}\n' % line_indent
+        else:
+            if escaped and isinstance(value, str):
+                value = old_escape(value)
+            yield '%s"%s" "%s"\n' % (line_indent, key, value)
+
+
+def old_dumps(obj, pretty=False, escaped=True):
+    return ''.join(old_dump_gen(obj, pretty, escaped))
+
+
+def old_dump(obj, fp, pretty=False, escaped=True):
+    for chunk in old_dump_gen(obj, pretty, escaped):
+        fp.write(chunk)
+
+
+class CountingWriter(object):
+    def __init__(self):
+        self.calls = 0
+
+    def write(self, text):
+        self.calls += 1
+
+
+def main():
+    data = vdf.loads(config_text())
+
+    for escaped in (True, False):
+        assert vdf.dumps(data, pretty=True, escaped=escaped) == old_dumps(data, pretty=True, escaped=escaped)
+        before = best_of(lambda: old_dumps(data, pretty=True, escaped=escaped))
+        after = best_of(lambda: vdf.dumps(data, pretty=True, escaped=escaped))
+        print('dumps(pretty=True, escaped=%-5s) %.3fs -> %.3fs (%.1fx)'
+              % (escaped, before, after, before / after))
+
+    before = best_of(lambda: old_dump(data, io.StringIO(), pretty=True))
+    after = best_of(lambda: vdf.dump(data, io.StringIO(), pretty=True))
+    print('dump(StringIO)                   %.3fs -> %.3fs (%.1fx)' % (before, after, before / after))
+
+    old_writer, writer = CountingWriter(), CountingWriter()
+    old_dump(data, old_writer, pretty=True)
+    vdf.dump(data, writer, pretty=True)
+    print('dump() write calls               %d -> %d' % (old_writer.calls, writer.calls))
+
+    deep = level = {}
+    for _ in range(5000):
+        level['k'] = level = {}
+    print('5000-level tree dumps to         %d chars' % len(vdf.dumps(deep, pretty=True)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Microbenchmark of vdf._escape / vdf._unescape against the re.sub versions
+they replaced. Also checks that both give the same output.
+
+    python tests/bench_escape.py
+"""
+import random
+import re
+
+from _benchdata import best_of, vdf
+
+_unescape_char_map = {
+    r"\n": "\n",
+    r"\t": "\t",
+    r"\v": "\v",
+    r"\b": "\b",
+    r"\r": "\r",
+    r"\f": "\f",
+    r"\a": "\a",
+    r"\\": "\\",
+    r"\?": "?",
+    r"\"": "\"",
+    r"\'": "\'",
+}
+_escape_char_map = dict((v, k) for k, v in _unescape_char_map.items())
+
+
+def old_escape(text):
+    return re.sub(r"[\n\t\v\b\r\f\a\\\?\"']", lambda m: _escape_char_map[m.group()], text)
+
+
+def old_unescape(text):
+    return re.sub(r"(\\n|\\t|\\v|\\b|\\r|\\f|\\a|\\\\|\\\?|\\\"|\\')",
+                  lambda m: _unescape_char_map[m.group()], text)
+
+
+# config.vdf-shaped strings: ids, key names, launch options, escaped Windows paths
+ESCAPED = ['76561198000000001', 'AutoLoginUser', 'RememberPassword', '1', 'name', 'LastPlayed',
+           '1697040000', 'Software', 'Valve', 'Steam', 'apps', '440', 'cloud', 'launchoptions',
+           '-novid -high', 'C:\\\\Program Files (x86)\\\\Steam'] * 1000
+RAW = [old_unescape(text) for text in ESCAPED]
+
+
+def check(count=200000, seed=0):
+    rng = random.Random(seed)
+    alphabet = 'ab\\n"\'?\t\r\x07\x08\x0b\x0c x'
+    for _ in range(count):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        assert vdf._escape(text) == old_escape(text), repr(text)
+        assert vdf._unescape(text) == old_unescape(text), repr(text)
+
+
+def main():
+    check()
+    print('%d strings' % len(ESCAPED))
+    for label, old, new, data in (('unescape', old_unescape, vdf._unescape, ESCAPED),
+                                  ('escape', old_escape, vdf._escape, RAW)):
+        before = best_of(lambda: [old(text) for text in data])
+        after = best_of(lambda: [new(text) for text in data])
+        print('%-9s %6.1fms -> %6.1fms (%.1fx)' % (label, before * 1e3, after * 1e3, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import copy
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+import vdf
+from vdf.cidict import CaseInsensitiveDict
+
+TEXT = '"Users"\n{\n"Alice" "1"\n"BOB" "2"\n}\n"users"\n{\n"carol" "3"\n}\n'
+
+
+class CaseInsensitiveDictCopies(unittest.TestCase):
+    def setUp(self):
+        self.d = vdf.loads(TEXT, mapper=CaseInsensitiveDict)
+
+    def assertIndependent(self, result):
+        self.assertIsInstance(result, CaseInsensitiveDict)
+        self.assertEqual(list(result.items()), list(self.d.items()))
+
+        result['USERS'] = 'replaced'
+        result['new'] = '1'
+        self.assertNotIn('new', self.d)
+        self.assertEqual(list(self.d), ['Users'])
+        self.assertEqual(self.d['users']['bob'], '2')
+
+    def test_copy_method(self):
+        result = self.d.copy()
+        self.assertIs(result['users'], self.d['users'])
+        self.assertIndependent(result)
+
+    def test_copy_module(self):
+        result = copy.copy(self.d)
+        self.assertIs(result['users'], self.d['users'])
+        self.assertIndependent(result)
+
+    def test_deepcopy(self):
+        result = copy.deepcopy(self.d)
+        self.assertIsNot(result['users'], self.d['users'])
+        users = result['users']
+        self.assertIndependent(result)
+
+        users['alice'] = 'changed'
+        self.assertEqual(self.d['users']['Alice'], '1')
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.d))
+        self.assertEqual(result.original_key('USERS'), 'Users')
+        self.assertIndependent(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
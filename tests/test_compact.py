@@ -0,0 +1,41 @@
+import copy
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+from vdf.compact import COMPACT_MAX_KEYS, CompactDict
+
+
+class CompactDictCopies(unittest.TestCase):
+    def check_copies(self, size):
+        d = CompactDict(('k%d' % i, str(i)) for i in range(size))
+        d['block'] = CompactDict([('x', 'y')])
+        expected = list(d.items())
+
+        for result in (d.copy(), copy.copy(d), copy.deepcopy(d), pickle.loads(pickle.dumps(d))):
+            self.assertIsInstance(result, CompactDict)
+            self.assertEqual(list(result.items()), expected)
+
+            result['k0'] = 'changed'
+            result['new'] = '1'
+            del result['k1']
+            self.assertEqual(list(d.items()), expected)
+
+    def test_tuple_storage(self):
+        self.check_copies(3)
+
+    def test_dict_storage(self):
+        self.check_copies(COMPACT_MAX_KEYS + 4)
+
+    def test_shallow_copies_share_values(self):
+        d = CompactDict(('k%d' % i, str(i)) for i in range(COMPACT_MAX_KEYS + 4))
+        d['block'] = CompactDict()
+        self.assertIs(copy.copy(d)['block'], d['block'])
+        self.assertIsNot(copy.deepcopy(d)['block'], d['block'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+import vdf
+from vdf.vdict import VDFDict
+
+import _vdf_reference as reference
+
+CASES = [
+    '',
+    '"a" "b"\n',
+    '"a"\t\t"b"',
+    '"a"\n{\n\t"b" "c"\n}\n',
+    '"a"\r\n{\r\n\t"b"\t\t"c"\r\n}\r\n',
+    '"a" {\n"b" "c"\n}\n',
+    '"a" {}\n"b" { }\n',
+    'key value with spaces\nk2 /path/to\n',
+    '#base "file.vdf"\n',
+    '// comment\n"a" "b" // trailing\n/ not quite a comment\n',
+    '"multi" "line\nvalue\n"\n',
+    '"esc\\"aped" "v\\\\al\\n"\n',
+    '\ufeff"bom" "1"\n',
+    '"a" "1"\n"A" "2"\n"a" "3"\n',
+    '"a"\n{\n"x" "1"\n}\n"a"\n{\n"y" "2"\n}\n',
+    '"a" "1"\n"a"\n{\n"x" "y"\n}\n',
+    '"a"\n{\n"x" "y"\n}\n"a" "1"\n',
+    '"k" "v" "extra"\n',
+    '"k"\n\n\n{\n}\n',
+]
+
+SYNTAX_ERRORS = [
+    # (document, message, line number)
+    ('"a"\n"b" "c"\n', "vdf.parse: expected openning bracket", 2),
+    ('}\n', "vdf.parse: one too many closing parenthasis", 1),
+    ('"a"\n{\n"b" "c"\n}\n}\n', "vdf.parse: one too many closing parenthasis", 5),
+    ('"a"\n{\n"b" "c"\n', "vdf.parse: unclosed parenthasis or quotes (EOF)", 3),
+    ('"a" "b"\n"c" "open\nvalue\n', "vdf.parse: unexpected EOF (open quote for value?)", 2),
+    ('"x" "y"\n\n"open key\n', "vdf.parse: unexpected EOF (open key quote?)", 3),
+]
+
+ATOMS = ['"a"', '"b"', '"key"', 'k', 'x1', '"v\\"q"', '"multi\nline"', '"open', '{', '}', '"x" {',
+         '"x" {}', '"y" { }', '//c', '/', '\n', '  ', '\t', '"k" "v"', '"k" v a l', '"k" "v', '"\\n"',
+         '\r\n', '"A"', '"a" "1"', '#base x', '"z"\n{', '"b" "2" // x', '"k" /x/']
+
+
+def outcome(loads, text, **kwargs):
+    try:
+        return ('ok', loads(text, **kwargs))
+    except SyntaxError as e:
+        return ('SyntaxError', e.msg, e.lineno, e.text)
+
+
+class ParseMatchesReference(unittest.TestCase):
+    def assertSameOutcome(self, text, **kwargs):
+        self.assertEqual(outcome(vdf.loads, text, **kwargs),
+                         outcome(reference.loads, text, **kwargs),
+                         '%r %r' % (text, kwargs))
+
+    def test_cases(self):
+        for text in CASES:
+            for kwargs in ({}, {'escaped': False}, {'merge_duplicate_keys': False}):
+                self.assertSameOutcome(text, **kwargs)
+
+    def test_vdfdict_keeps_duplicates(self):
+        text = CASES[13] + CASES[14]
+        result = vdf.loads(text, mapper=VDFDict, merge_duplicate_keys=False)
+        expected = reference.loads(text, mapper=VDFDict, merge_duplicate_keys=False)
+        self.assertEqual(list(result.items()), list(expected.items()))
+        self.assertEqual(result.get_all_for('a')[:2], ['1', '3'])
+
+    def test_parse_file_object(self):
+        text = CASES[3]
+        self.assertEqual(vdf.parse(io.StringIO(text)), reference.parse(io.StringIO(text)))
+
+    def test_random_documents(self):
+        rng = random.Random(1)
+        for _ in range(3000):
+            text = ''.join(rng.choice(ATOMS) + rng.choice(['\n', ' ', '', '\n\n'])
+                           for _ in range(rng.randint(0, 12)))
+            self.assertSameOutcome(text)
+            self.assertSameOutcome(text, merge_duplicate_keys=False)
+
+
+class ParseSyntaxErrors(unittest.TestCase):
+    def test_messages_and_line_numbers(self):
+        for text, message, lineno in SYNTAX_ERRORS:
+            with self.assertRaises(SyntaxError) as ctx:
+                vdf.loads(text)
+            self.assertEqual((ctx.exception.msg, ctx.exception.lineno), (message, lineno), repr(text))
+            self.assertEqual(outcome(vdf.loads, text), outcome(reference.loads, text))
+
+    def test_file_name(self):
+        with self.assertRaises(SyntaxError) as ctx:
+            vdf.loads('}\n')
+        self.assertEqual(ctx.exception.filename, '<StringIO>')
+
+
+if __name__ == '__main__':
+    unittest.main()
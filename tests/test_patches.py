@@ -0,0 +1,185 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+import vdf
+
+STEAM = ['Registry', 'HKCU', 'Software', 'Valve', 'Steam']
+LOGIN = {'AutoLoginUser': 'alice', 'RememberPassword': '1', 'AlreadyLoggedIn': '0'}
+
+REGISTRY = (
+    '"Registry"\n'
+    '{\n'
+    '\t"HKCU"\n'
+    '\t{\n'
+    '\t\t"Software"\n'
+    '\t\t{\n'
+    '\t\t\t"Valve"\n'
+    '\t\t\t{\n'
+    '\t\t\t\t"Steam"\n'
+    '\t\t\t\t{\n'
+    '\t\t\t\t\t// written by Steam\n'
+    '\t\t\t\t\t"language"\t\t"english"\n'
+    '\t\t\t\t\t"AutoLoginUser"   "bob"\n'
+    '\t\t\t\t\t"RememberPassword"\t\t"1"\n'
+    '\t\t\t\t\t"AlreadyLoggedIn"\t\t"1"\n'
+    '\t\t\t\t\t"Path"\t\t"C:\\\\Program Files (x86)\\\\Steam"\n'
+    '\t\t\t\t}\n'
+    '\t\t\t}\n'
+    '\t\t}\n'
+    '\t}\n'
+    '}\n'
+)
+
+
+def patched_tree(text, path, values):
+    """The tree that loads() should give for the patched text."""
+    tree = vdf.loads(text)
+    node = tree
+    for part in path:
+        if not isinstance(node.get(part), dict):
+            node[part] = {}
+        node = node[part]
+    node.update(values)
+    return tree
+
+
+class PatchesByteIdentity(unittest.TestCase):
+    def test_only_values_change(self):
+        result = vdf.patches(REGISTRY, STEAM, LOGIN)
+        expected = (REGISTRY.replace('"AutoLoginUser"   "bob"', '"AutoLoginUser"   "alice"')
+                            .replace('"AlreadyLoggedIn"\t\t"1"', '"AlreadyLoggedIn"\t\t"0"'))
+        self.assertEqual(result, expected)
+
+    def test_same_values_leave_document_unchanged(self):
+        values = {'AutoLoginUser': 'bob', 'RememberPassword': '1', 'AlreadyLoggedIn': '1'}
+        self.assertEqual(vdf.patches(REGISTRY, STEAM, values), REGISTRY)
+
+    def test_crlf_document(self):
+        text = REGISTRY.replace('\n', '\r\n')
+        result = vdf.patches(text, STEAM, LOGIN)
+        self.assertEqual(result, vdf.patches(REGISTRY, STEAM, LOGIN).replace('\n', '\r\n'))
+
+    def test_values_are_escaped(self):
+        result = vdf.patches(REGISTRY, STEAM, {'AutoLoginUser': 'a"b\\c'})
+        self.assertIn('"AutoLoginUser"   "a\\"b\\\\c"\n', result)
+        self.assertEqual(vdf.loads(result)['Registry']['HKCU']['Software']['Valve']['Steam']['AutoLoginUser'],
+                         'a"b\\c')
+
+    def test_unescaped(self):
+        result = vdf.patches(REGISTRY, STEAM, {'AutoLoginUser': 'a\\b'}, escaped=False)
+        self.assertIn('"AutoLoginUser"   "a\\b"\n', result)
+
+    def test_case_insensitive(self):
+        text = REGISTRY.replace('"AutoLoginUser"', '"autologinuser"').replace('"Steam"\n', '"steam"\n')
+        result = vdf.patches(text, STEAM, {'AutoLoginUser': 'alice'}, case_insensitive=True)
+        self.assertEqual(result, text.replace('"bob"', '"alice"'))
+
+    def test_case_sensitive_inserts(self):
+        text = '"Steam"\n{\n\t"autologinuser"\t\t"bob"\n}\n'
+        result = vdf.patches(text, ['Steam'], {'AutoLoginUser': 'alice'})
+        self.assertEqual(result, '"Steam"\n{\n\t"autologinuser"\t\t"bob"\n\t"AutoLoginUser"\t\t"alice"\n}\n')
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            vdf.patches('"Registry"\n{\n', STEAM, LOGIN)
+
+
+class PatchesInsertion(unittest.TestCase):
+    def test_missing_keys_use_sibling_indentation(self):
+        text = '"Steam"\n{\n    "Other"  "x"\n}\n'
+        result = vdf.patches(text, ['Steam'], {'AutoLoginUser': 'alice'})
+        self.assertEqual(result, '"Steam"\n{\n    "Other"  "x"\n    "AutoLoginUser"\t\t"alice"\n}\n')
+
+    def test_last_duplicate_block(self):
+        text = '"Steam"\n{\n\t"a"\t\t"1"\n}\n"Steam"\n{\n\t"b"\t\t"2"\n}\n'
+        result = vdf.patches(text, ['Steam'], {'c': '3'})
+        self.assertEqual(result, text[:-2] + '\t"c"\t\t"3"\n}\n')
+
+    def test_missing_blocks(self):
+        text = '"Registry"\n{\n\t"HKCU"\n\t{\n\t}\n}\n'
+        result = vdf.patches(text, STEAM, LOGIN)
+        self.assertEqual(vdf.loads(result), patched_tree(text, STEAM, LOGIN))
+        self.assertTrue(result.startswith('"Registry"\n{\n\t"HKCU"\n\t{\n\t\t"Software"\n\t\t{\n'))
+
+    def test_empty_document(self):
+        result = vdf.patches('', ['Steam'], {'k': 'v'})
+        self.assertEqual(result, '"Steam"\n{\n\t"k"\t\t"v"\n}\n')
+
+    def test_unterminated_document(self):
+        result = vdf.patches('"x" "y"', ['Steam'], {'k': 'v'})
+        self.assertEqual(result, '"x" "y"\n"Steam"\n{\n\t"k"\t\t"v"\n}\n')
+
+    def test_same_line_block(self):
+        text = '"Registry"\n{\n\t"HKCU"\n\t{\n\t\t"Steam" {}\n\t}\n}\n'
+        result = vdf.patches(text, ['Registry', 'HKCU', 'Steam'], {'k': 'v'})
+        self.assertEqual(result, '"Registry"\n{\n\t"HKCU"\n\t{\n\t\t"Steam" {\n\t\t\t"k"\t\t"v"\n\t\t}\n\t}\n}\n')
+
+
+class PatchesLineEndings(unittest.TestCase):
+    DOCUMENTS = [
+        REGISTRY,
+        '"Registry"\n{\n\t"HKCU"\n\t{\n\t}\n}\n',
+        '"Registry"\n{\n}',
+        '"x" "y"\n',
+        '"Registry"\n{\n\t"HKCU"\n\t{\n\t\t"Software"\n\t\t{\n\t\t\t"Valve"\n\t\t\t{\n'
+        '\t\t\t\t"Steam" {}\n\t\t\t}\n\t\t}\n\t}\n}\n',
+    ]
+
+    def test_crlf_insertions(self):
+        for text in self.DOCUMENTS:
+            values = dict(LOGIN, NewKey='1')
+            lf = vdf.patches(text, STEAM, values)
+            crlf = vdf.patches(text.replace('\n', '\r\n'), STEAM, values)
+            self.assertEqual(crlf, lf.replace('\n', '\r\n'), repr(text))
+            self.assertEqual(crlf.count('\n'), crlf.count('\r\n'))
+
+    def test_crlf_same_line_block(self):
+        text = '"Registry"\r\n{\r\n\t"HKCU"\r\n\t{\r\n\t\t"Steam" {}\r\n\t}\r\n}\r\n'
+        result = vdf.patches(text, ['Registry', 'HKCU', 'Steam'], {'k': 'v'})
+        self.assertEqual(result, '"Registry"\r\n{\r\n\t"HKCU"\r\n\t{\r\n\t\t"Steam" {\r\n'
+                                 '\t\t\t"k"\t\t"v"\r\n\t\t}\r\n\t}\r\n}\r\n')
+
+    def test_line_ending_taken_from_first_line(self):
+        result = vdf.patches('"x" "y"\n"z" "w"\r\n', ['Steam'], {'k': 'v'})
+        self.assertEqual(result, '"x" "y"\n"z" "w"\r\n"Steam"\n{\n\t"k"\t\t"v"\n}\n')
+
+
+class PatchesMatchesParse(unittest.TestCase):
+    TOKENS = ['"a"', '"b"', '"k"', '"1"', '"x y"', '{\n', '}\n', '\n', '\t', '"a" {}\n', '"k" "old"\n', '"j" "o"\n']
+
+    def test_random_documents(self):
+        rng = random.Random(11)
+        checked = 0
+        while checked < 2000:
+            text = ''.join(rng.choice(self.TOKENS) for _ in range(rng.randint(0, 30)))
+            try:
+                tree = vdf.loads(text)
+            except SyntaxError:
+                continue
+            # scalar values at the top level named like a block on the path are not replaced
+            if any(not isinstance(value, dict) for key, value in tree.items() if key in ('a', 'b')):
+                continue
+
+            path = [rng.choice('ab') for _ in range(rng.randint(0, 3))]
+            values = dict((rng.choice(['k', 'j', 'n']), rng.choice(['v', 'w"q', '']))
+                          for _ in range(rng.randint(1, 2)))
+            node = tree
+            for part in path:
+                node = node.get(part) if isinstance(node.get(part), dict) else {}
+            if any(isinstance(node.get(key), dict) for key in values):
+                continue
+
+            for newline in ('\n', '\r\n'):
+                source = text.replace('\n', newline)
+                result = vdf.patches(source, path, values)
+                self.assertEqual(vdf.loads(result), patched_tree(source, path, values),
+                                 '%r %r %r' % (source, path, values))
+            checked += 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import copy
+import json
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'usr', 'share', 'steam-pass'))
+
+import vdf
+from vdf.vdict import VDFDict
+
+TEXT = '"a" "1"\n"b" "2"\n"a" "3"\n"c"\n{\n"x" "y"\n}\n'
+
+
+class VDFDictProtocols(unittest.TestCase):
+    def setUp(self):
+        self.d = vdf.loads(TEXT, mapper=VDFDict)
+
+    def assertSameItems(self, result, expected):
+        self.assertIsInstance(result, VDFDict)
+        self.assertEqual(list(result.items()), list(expected.items()))
+
+    def test_json_sees_entries(self):
+        self.assertEqual(json.dumps(self.d), '{"a": "1", "b": "2", "a": "3", "c": {"x": "y"}}')
+        self.assertEqual(json.dumps(VDFDict()), '{}')
+
+    def test_json_after_deletes(self):
+        del self.d['a']
+        del self.d['a']
+        self.assertEqual(json.dumps(self.d), '{"b": "2", "c": {"x": "y"}}')
+
+    def test_copy_method(self):
+        result = self.d.copy()
+        self.assertSameItems(result, self.d)
+        self.assertIs(result['c'], self.d['c'])
+
+        # the copy does not share storage with the original
+        result['z'] = '9'
+        del result[(1, 'a')]
+        self.assertNotIn('z', self.d)
+        self.assertEqual(self.d.get_all_for('a'), ['1', '3'])
+
+    def test_copy_module(self):
+        result = copy.copy(self.d)
+        self.assertSameItems(result, self.d)
+        self.assertIs(result['c'], self.d['c'])
+
+        result['z'] = '9'
+        self.assertEqual(len(self.d), 4)
+
+    def test_deepcopy(self):
+        result = copy.deepcopy(self.d)
+        self.assertSameItems(result, self.d)
+        self.assertEqual(len(result), 4)
+        self.assertIsNot(result['c'], self.d['c'])
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.d))
+        self.assertSameItems(result, self.d)
+        self.assertIsInstance(result['c'], VDFDict)
+
+    def test_dict_constructor(self):
+        self.assertEqual(dict(self.d), {'a': '1', 'b': '2', 'c': self.d['c']})
+
+    def test_empty_after_clear_and_deletes(self):
+        self.d.clear()
+        self.assertEqual(len(self.d), 0)
+        self.assertEqual(json.dumps(self.d), '{}')
+
+        d = VDFDict([('k', str(i)) for i in range(40)])
+        for _ in range(40):
+            del d['k']
+        self.assertEqual(json.dumps(d), '{}')
+        self.assertFalse(d)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,646 @@
+import threading
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import gi
+
+from utils.avatars import AvatarCache
+from utils.icons import IconRegistry
+from utils.search import SearchIndex
+from utils.integration import is_running_as_appimage, is_installed, install_appimage
+from utils.steam_manager import SteamManager
+
+# Configuração do GTK4 + Libadwaita
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from gi.repository import Gtk, Gio, GLib, Gdk, Adw, GObject
+
+APP_ID = 'io.github.narayanls.steampass.app'
+
+class UserItem(GObject.Object):
+    """Item do Gio.ListStore com os dados de uma conta."""
+
+    def __init__(self, user_data):
+        super().__init__()
+        # UserRecord: imutável, então pode ser comparado direto
+        self.user_data = user_data
+
+    @property
+    def diff_key(self):
+        # Mesmo SteamID com dados iguais = item inalterado
+        return self.user_data
+
+class UserRow(Gtk.Box):
+    """Widget de uma linha. É reaproveitado pelo Gtk.ListView ao rolar a lista."""
+
+    def __init__(self, icons, delete_callback, select_callback):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        
+        self.user_data = None
+        self.set_margin_top(8)
+        self.set_margin_bottom(8)
+        self.set_margin_start(10)
+        self.set_margin_end(10)
+
+        # 0. Caixa de seleção, visível só no modo de seleção múltipla
+        self.check = Gtk.CheckButton()
+        self.check.set_valign(Gtk.Align.CENTER)
+        self.check.set_visible(False)
+        self.check.connect("toggled", lambda btn: select_callback(self.user_data.account_name, btn.get_active()))
+        self.append(self.check)
+
+        # 1. Ícone genérico, trocado pelo avatar da conta quando ele termina de carregar
+        icon_img = icons.image("avatar-default-symbolic")
+        icon_img.set_pixel_size(32)
+        self.icon = icon_img
+        self.append(icon_img)
+
+        self.avatar = Gtk.Image()
+        self.avatar.set_pixel_size(32)
+        self.avatar.set_visible(False)
+        self.append(self.avatar)
+
+        # 2. Texto
+        text_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+        text_box.set_valign(Gtk.Align.CENTER)
+        # Hexpand empurra o próximo elemento (botão X) para o final
+        text_box.set_hexpand(True) 
+
+        self.lbl_persona = Gtk.Label()
+        self.lbl_persona.set_halign(Gtk.Align.START)
+        self.lbl_persona.add_css_class("title-4")
+
+        self.lbl_account = Gtk.Label()
+        self.lbl_account.set_halign(Gtk.Align.START)
+        self.lbl_account.add_css_class("dim-label")
+
+        text_box.append(self.lbl_persona)
+        text_box.append(self.lbl_account)
+        self.append(text_box)
+
+        # 3. Botão Remover (X Vermelho)
+        btn_delete = icons.button("window-close-symbolic")
+        btn_delete.add_css_class("destructive-action")
+        btn_delete.add_css_class("flat") 
+        btn_delete.set_valign(Gtk.Align.CENTER)
+        btn_delete.set_tooltip_text("Remover conta da lista")
+        
+        # Conecta o clique. Usamos lambda para passar o nome atual da conta
+        btn_delete.connect("clicked", lambda btn: delete_callback(btn, self.user_data.account_name))
+        self.btn_delete = btn_delete
+
+        # Spinner mostrado no lugar do X enquanto a troca para esta conta acontece
+        self.spinner = Gtk.Spinner()
+        self.spinner.set_valign(Gtk.Align.CENTER)
+        self.spinner.set_visible(False)
+
+        self.append(self.spinner)
+        self.append(btn_delete)
+
+    def bind(self, user_data, busy=False, selecting=False, selected=False):
+        """Preenche a linha com os dados de uma conta."""
+        self.user_data = user_data
+        self.lbl_persona.set_label(user_data.persona_name)
+        self.lbl_account.set_label(user_data.account_name)
+
+        self.check.set_visible(selecting)
+        self.check.set_active(selected)
+
+        self.spinner.set_visible(busy)
+        self.spinner.set_spinning(busy)
+        self.btn_delete.set_visible(not busy and not selecting)
+
+    def set_avatar(self, texture):
+        """Mostra o avatar da conta; None volta para o ícone genérico."""
+        self.avatar.set_from_paintable(texture)
+        self.avatar.set_visible(texture is not None)
+        self.icon.set_visible(texture is None)
+
+class SteamPassWindow(Adw.ApplicationWindow):
+    def __init__(self, app, manager, icons):
+        super().__init__(application=app, title="Steam Pass")
+        self.set_icon_name(APP_ID) 
+        self.manager = manager
+        self.icons = icons
+        self.set_default_size(300, 400)
+
+        self.avatars = AvatarCache(manager.avatar_dir)
+
+        # Outer box: header + content (Adw.ApplicationWindow pattern)
+        outer_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.set_content(outer_box)
+
+        header = Adw.HeaderBar()
+        # O subtítulo mostra o andamento da troca de conta
+        self.window_title = Adw.WindowTitle(title="Steam Pass")
+        header.set_title_widget(self.window_title)
+        outer_box.append(header)
+
+        # Modo de seleção para remover várias contas de uma vez
+        self.btn_select = Gtk.ToggleButton(icon_name="object-select-symbolic")
+        self.btn_select.set_tooltip_text("Selecionar contas")
+        self.btn_select.connect("toggled", self.on_select_toggled)
+        header.pack_end(self.btn_select)
+
+        self.selecting = False
+        self.selected_accounts = set()
+
+        # Conta sendo ativada no momento (None = nenhuma troca em andamento)
+        self.switching_account = None
+        # Aplicação segurada durante a troca; a janela fechada já não a devolve
+        self.switch_app = None
+        # Depois de fechada, a janela não deve mais ser atualizada
+        self.closed = False
+
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        main_box.set_vexpand(True)
+        outer_box.append(main_box)
+
+        # Modelo da lista: os widgets das linhas são criados sob demanda e reciclados
+        # Até a primeira leitura do loginusers.vdf, lista vazia não é "nenhum usuário"
+        self.users_checked = False
+        self.store = Gio.ListStore(item_type=UserItem)
+        self.store.connect("items-changed", self.on_store_changed)
+
+        # Busca: o índice de trigramas decide quais SteamIDs passam pelo filtro
+        self.search_index = SearchIndex()
+        self.search_text = ""
+        self.search_matches = None  # None = sem busca, mostra todas
+        self.search_filter = Gtk.CustomFilter.new(self.filter_user)
+        self.filtered = Gtk.FilterListModel(model=self.store, filter=self.search_filter)
+        self.filtered.connect("items-changed", self.on_store_changed)
+
+        self.search_entry = Gtk.SearchEntry(placeholder_text="Buscar conta")
+        self.search_entry.set_margin_top(6)
+        self.search_entry.set_margin_start(10)
+        self.search_entry.set_margin_end(10)
+        self.search_entry.set_margin_bottom(6)
+        # Digitar em qualquer lugar da janela já começa a busca
+        self.search_entry.set_key_capture_widget(self)
+        self.search_entry.connect("search-changed", self.on_search_changed)
+        self.search_entry.connect("activate", self.on_search_activate)
+        self.search_entry.connect("stop-search", lambda entry: entry.set_text(""))
+        main_box.append(self.search_entry)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self.on_row_setup)
+        factory.connect("bind", self.on_row_bind)
+
+        self.listview = Gtk.ListView(model=Gtk.NoSelection(model=self.filtered), factory=factory)
+        self.listview.set_single_click_activate(True)
+        self.listview.connect("activate", self.on_row_activated)
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_vexpand(True)
+        scrolled.set_child(self.listview)
+
+        placeholder = Gtk.Label(label="Nenhum usuário encontrado.")
+        placeholder.set_margin_top(20)
+        placeholder.set_valign(Gtk.Align.START)
+
+        self.list_stack = Gtk.Stack()
+        self.list_stack.set_vexpand(True)
+        self.list_stack.add_named(scrolled, "list")
+        self.list_stack.add_named(placeholder, "empty")
+
+        no_results = Gtk.Label(label="Nenhuma conta corresponde à busca.")
+        no_results.set_margin_top(20)
+        no_results.set_valign(Gtk.Align.START)
+        self.list_stack.add_named(no_results, "no-results")
+        main_box.append(self.list_stack)
+
+        # Botão + no rodapé
+        action_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        action_box.set_halign(Gtk.Align.CENTER)
+        action_box.set_margin_top(10)
+        action_box.set_margin_bottom(10)
+        
+        # Ícone de +
+        btn_add = icons.button("list-add-symbolic")
+        btn_add.add_css_class("suggested-action") 
+        btn_add.add_css_class("circular") # Deixa o botão redondo
+        btn_add.set_tooltip_text("Adicionar nova conta")
+        btn_add.connect("clicked", self.on_add_account_clicked)
+        self.btn_add = btn_add
+
+        # No modo de seleção o + dá lugar ao botão de remover as selecionadas
+        btn_remove = Gtk.Button(label="Remover selecionadas")
+        btn_remove.add_css_class("destructive-action")
+        btn_remove.add_css_class("pill")
+        btn_remove.set_visible(False)
+        btn_remove.set_sensitive(False)
+        btn_remove.connect("clicked", self.on_remove_selected_clicked)
+        self.btn_remove = btn_remove
+        
+        action_box.append(btn_add)
+        action_box.append(btn_remove)
+        main_box.append(action_box)
+
+        # Primeiro quadro a partir do snapshot em cache; o loginusers.vdf de verdade
+        # é conferido em segundo plano e só as diferenças são aplicadas
+        self.load_generation = 0
+        self.load_users(self.manager.get_snapshot_users() or [])
+        threading.Thread(target=self.check_users, args=(self.load_generation,), daemon=True).start()
+        self.watch_steam_files()
+
+    def check_users(self, generation):
+        """Roda fora da thread do GTK: lê a lista atual e entrega via GLib.idle_add."""
+        GLib.idle_add(self.on_users_checked, self.manager.get_users(), generation)
+
+    def on_users_checked(self, users, generation):
+        self.users_checked = True
+        # Se a lista foi recarregada depois (arquivo alterado, conta removida), o
+        # resultado desta thread é mais antigo e não pode sobrescrever o atual
+        if generation == self.load_generation:
+            self.load_users(users)
+        else:
+            self.on_store_changed()
+        return GLib.SOURCE_REMOVE
+
+    def load_users(self, users=None):
+        """Sincroniza o modelo com o get_users, mexendo só nos itens que mudaram."""
+        self.load_generation += 1
+        if users is None:
+            users = self.manager.get_users()
+
+        # O índice muda só nas contas alteradas; a busca ativa é refeita antes do
+        # splice, para que o filtro já avalie os itens novos com o resultado certo
+        self.search_index.update(users)
+        if self.search_matches is not None:
+            self.search_matches = self.search_index.search(self.search_text)
+            self.search_filter.changed(Gtk.FilterChange.DIFFERENT)
+
+        new_items = [UserItem(user) for user in users]
+        old_keys = [item.diff_key for item in self.store]
+        new_keys = [item.diff_key for item in new_items]
+
+        # Diff por SteamID; aplicado de trás para frente para manter as posições válidas
+        matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag != 'equal':
+                self.store.splice(i1, i2 - i1, new_items[j1:j2])
+
+        self.on_store_changed(self.store)
+
+    def on_store_changed(self, *args):
+        if self.users_checked and not self.store.get_n_items():
+            self.list_stack.set_visible_child_name("empty")
+        elif self.search_matches is not None and not self.filtered.get_n_items():
+            self.list_stack.set_visible_child_name("no-results")
+        else:
+            self.list_stack.set_visible_child_name("list")
+
+    def filter_user(self, item):
+        return self.search_matches is None or item.user_data.steam_id in self.search_matches
+
+    def on_search_changed(self, entry):
+        previous, self.search_text = self.search_text, entry.get_text()
+        self.search_matches = self.search_index.search(self.search_text)
+
+        # Texto que só cresceu só pode tirar itens; que só encolheu, só devolver.
+        # Assim o filtro reavalia apenas parte da lista
+        if self.search_text.startswith(previous):
+            change = Gtk.FilterChange.MORE_STRICT
+        elif previous.startswith(self.search_text):
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        self.search_filter.changed(change)
+        self.on_store_changed()
+
+    def on_search_activate(self, entry):
+        # Enter na busca equivale a clicar no primeiro resultado
+        if self.filtered.get_n_items():
+            self.on_row_activated(self.listview, 0)
+
+    def on_row_setup(self, factory, list_item):
+        # Passamos os callbacks de delete e de seleção
+        list_item.set_child(UserRow(self.icons, self.on_delete_clicked, self.on_account_selected))
+
+    def on_row_bind(self, factory, list_item):
+        user = list_item.get_item().user_data
+        row = list_item.get_child()
+        row.bind(
+            user,
+            busy=user.account_name == self.switching_account,
+            selecting=self.selecting,
+            selected=user.account_name in self.selected_accounts,
+        )
+
+        # Avatar: na hora se já está em memória, senão a linha é preenchida depois
+        found, texture = self.avatars.lookup(user.steam_id)
+        row.set_avatar(texture)
+        if not found:
+            self.avatars.request(user.steam_id, lambda steam_id, texture: self.on_avatar_loaded(row, steam_id, texture))
+
+    def on_avatar_loaded(self, row, steam_id, texture):
+        # A linha pode ter sido reciclada para outra conta enquanto o avatar carregava
+        if row.user_data and row.user_data.steam_id == steam_id:
+            row.set_avatar(texture)
+
+    def watch_steam_files(self):
+        """Recarrega a lista quando a Steam altera o loginusers.vdf ou o registro."""
+        self.monitors = []
+        self.reload_source = 0
+
+        for path in (self.manager.config_path, self.manager.registry_file):
+            if not path:
+                continue
+            monitor = Gio.File.new_for_path(str(path)).monitor_file(Gio.FileMonitorFlags.NONE, None)
+            monitor.connect("changed", self.on_steam_file_changed)
+            self.monitors.append(monitor)
+
+        self.connect("close-request", self.on_close_request)
+
+    def on_steam_file_changed(self, monitor, file, other_file, event_type):
+        # A Steam costuma gravar várias vezes seguidas: espera a rajada terminar
+        if self.reload_source:
+            GLib.source_remove(self.reload_source)
+        self.reload_source = GLib.timeout_add(300, self.on_reload_timeout)
+
+    def on_reload_timeout(self):
+        self.reload_source = 0
+        self.load_users()
+        return GLib.SOURCE_REMOVE
+
+    def on_close_request(self, window):
+        self.closed = True
+        for monitor in self.monitors:
+            monitor.cancel()
+        if self.reload_source:
+            GLib.source_remove(self.reload_source)
+            self.reload_source = 0
+        return False
+
+    def on_row_activated(self, listview, position):
+        item = listview.get_model().get_item(position)
+        if item is None:
+            return
+            
+        user = item.user_data
+        account = user.account_name
+
+        # No modo de seleção o clique só marca/desmarca a conta
+        if self.selecting:
+            self.on_account_selected(account, account not in self.selected_accounts)
+            self.store.items_changed(self.store.find(item)[1], 1, 1)
+            return
+
+        print(f"Selecionado: {account}")
+        self.check_and_launch(account)
+
+    def on_add_account_clicked(self, button):
+        print("Solicitado: Nova Conta")
+        self.check_and_launch("") 
+
+    def on_delete_clicked(self, button, account_name):
+        """Callback chamado quando o X é clicado."""
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            modal=True,
+            message_type=Gtk.MessageType.QUESTION,
+            buttons=Gtk.ButtonsType.YES_NO,
+            text=f"Remover {account_name}?"
+        )
+        dialog.props.secondary_text = "Isso removerá a conta da lista de login automático e das credenciais salvas."
+        
+        # Conecta a resposta
+        dialog.connect("response", self.on_delete_confirmed, account_name)
+        dialog.present()
+
+    def on_delete_confirmed(self, dialog, response_id, account_name):
+        dialog.destroy()
+        if response_id == Gtk.ResponseType.YES:
+            self.manager.remove_user(account_name)
+            # Recarrega a lista para sumir com o item
+            self.load_users()
+
+    def on_select_toggled(self, button):
+        self.selecting = button.get_active()
+        self.selected_accounts.clear()
+
+        self.btn_add.set_visible(not self.selecting)
+        self.btn_remove.set_visible(self.selecting)
+        self.btn_remove.set_sensitive(False)
+
+        # Rebind de todas as linhas para mostrar/esconder as caixas de seleção
+        n_items = self.store.get_n_items()
+        self.store.items_changed(0, n_items, n_items)
+
+    def on_account_selected(self, account_name, selected):
+        if selected:
+            self.selected_accounts.add(account_name)
+        else:
+            self.selected_accounts.discard(account_name)
+        self.btn_remove.set_sensitive(bool(self.selected_accounts))
+
+    def on_remove_selected_clicked(self, button):
+        count = len(self.selected_accounts)
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            modal=True,
+            message_type=Gtk.MessageType.QUESTION,
+            buttons=Gtk.ButtonsType.YES_NO,
+            text=f"Remover {count} conta{'s' if count > 1 else ''}?"
+        )
+        dialog.props.secondary_text = "Isso removerá as contas da lista de login automático e das credenciais salvas."
+        dialog.connect("response", self.on_remove_selected_confirmed, sorted(self.selected_accounts))
+        dialog.present()
+
+    def on_remove_selected_confirmed(self, dialog, response_id, account_names):
+        dialog.destroy()
+        if response_id == Gtk.ResponseType.YES:
+            # Cada arquivo é lido e gravado uma única vez para todas as contas
+            self.manager.remove_users(account_names)
+            self.btn_select.set_active(False)
+            self.load_users()
+
+    def check_and_launch(self, account_name):
+        if self.switching_account is not None:
+            return
+
+        if self.manager.is_steam_running():
+            dialog = Gtk.MessageDialog(
+                transient_for=self,
+                modal=True,
+                message_type=Gtk.MessageType.WARNING,
+                buttons=Gtk.ButtonsType.YES_NO,
+                text="A Steam está rodando"
+            )
+            msg = "Deseja fechar a Steam e "
+            msg += "trocar de usuário?" if account_name else "fazer login em nova conta?"
+            
+            dialog.props.secondary_text = msg
+            
+            dialog.connect("response", self.on_dialog_response, account_name)
+            dialog.present()
+        else:
+            self.perform_switch(account_name)
+
+    def on_dialog_response(self, dialog, response_id, account_name):
+        dialog.destroy()
+        if response_id == Gtk.ResponseType.YES:
+            self.perform_switch(account_name, close_steam=True)
+
+    def perform_switch(self, account_name, close_steam=False):
+        """Inicia a troca numa thread separada, para não travar a interface."""
+        self.set_switching(account_name)
+        # Mantém o app vivo até a troca terminar, mesmo se a janela for fechada.
+        # Depois de fechada, get_application() devolve None: guarda a referência
+        self.switch_app = self.get_application()
+        self.switch_app.hold()
+        thread = threading.Thread(target=self.run_switch, args=(account_name, close_steam), daemon=True)
+        thread.start()
+
+    def run_switch(self, account_name, close_steam):
+        """Roda fora da thread do GTK: a interface só é atualizada via GLib.idle_add."""
+        try:
+            if close_steam:
+                GLib.idle_add(self.set_switch_progress, "Fechando a Steam…")
+                # A troca acontece assim que a Steam realmente sair; se ela continuar
+                # aberta, gravaria o login antigo por cima do nosso ao sair
+                if not self.manager.kill_steam():
+                    message = "A Steam não fechou a tempo."
+                    print(message)
+                    GLib.idle_add(self.on_switch_done, False, message)
+                    return
+
+            GLib.idle_add(self.set_switch_progress, "Trocando de conta…")
+            if account_name:
+                self.manager.set_active_user(account_name)
+            else:
+                self.manager.reset_login()
+
+            GLib.idle_add(self.set_switch_progress, "Abrindo a Steam…")
+            self.manager.launch_steam()
+        except Exception as e:
+            print(f"Erro ao trocar de conta: {e}")
+            GLib.idle_add(self.on_switch_done, False, f"Erro ao trocar de conta: {e}")
+            return
+
+        GLib.idle_add(self.on_switch_done, True)
+
+    def on_switch_done(self, success, message=None):
+        app, self.switch_app = self.switch_app, None
+        if not self.closed:
+            if success:
+                self.close()
+            else:
+                self.set_switching(None)
+                if message:
+                    self.show_switch_error(message)
+        app.release()
+        return GLib.SOURCE_REMOVE
+
+    def show_switch_error(self, message):
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            modal=True,
+            message_type=Gtk.MessageType.ERROR,
+            buttons=Gtk.ButtonsType.OK,
+            text="Não foi possível trocar de conta"
+        )
+        dialog.props.secondary_text = message
+        dialog.connect("response", lambda dialog, response_id: dialog.destroy())
+        dialog.present()
+
+    def set_switching(self, account_name):
+        """Liga/desliga o estado de troca: spinner na linha e interface bloqueada."""
+        previous, self.switching_account = self.switching_account, account_name
+        busy = account_name is not None
+
+        self.listview.set_sensitive(not busy)
+        self.btn_add.set_sensitive(not busy)
+        self.btn_select.set_sensitive(not busy)
+        if not busy:
+            self.window_title.set_subtitle("")
+
+        # Força o rebind das linhas envolvidas para mostrar/esconder o spinner
+        for position, item in enumerate(self.store):
+            if item.user_data.account_name in (previous, account_name):
+                self.store.items_changed(position, 1, 1)
+        return GLib.SOURCE_REMOVE
+
+    def set_switch_progress(self, message):
+        if self.closed:
+            return GLib.SOURCE_REMOVE
+        self.window_title.set_subtitle(message)
+        return GLib.SOURCE_REMOVE
+
+class SteamPassApp(Adw.Application):
+    def __init__(self):
+        super().__init__(application_id="io.github.narayanls.steampass.app", flags=Gio.ApplicationFlags.FLAGS_NONE)
+        
+        GLib.set_prgname("Steam Pass")
+        
+        self.manager = None
+        self.icons = None
+        self.win = None
+        
+        self.connect('startup', self.on_startup)
+
+    def on_startup(self, app):
+        Adw.Application.do_startup(self)
+        self.setup_icon_theme()
+
+    def setup_icon_theme(self):
+        current_dir = Path(__file__).parent.resolve()
+        scale = 1
+        try:
+            display = Gdk.Display.get_default()
+            if not display:
+                return
+
+            # Só o ícone do app vem do tema; se ele já está instalado no sistema,
+            # não há por que deixar toda busca no tema passar pelo diretório extra
+            icon_theme = Gtk.IconTheme.get_for_display(display)
+            bundled_icons_dir = current_dir.parent / "icons"
+            if bundled_icons_dir.exists() and not icon_theme.has_icon(APP_ID):
+                icon_theme.add_search_path(str(bundled_icons_dir))
+
+            monitors = display.get_monitors()
+            for i in range(monitors.get_n_items()):
+                scale = max(scale, monitors.get_item(i).get_scale_factor())
+        except Exception as e:
+            print(f"Erro ao configurar ícones: {e}")
+        finally:
+            # Os ícones das linhas e botões são carregados uma vez e compartilhados
+            self.icons = IconRegistry(current_dir / "icons", scale)
+
+    def do_activate(self):
+        try:
+            self.manager = SteamManager()
+            self.win = SteamPassWindow(self, self.manager, self.icons)
+            self.win.present()
+            
+            self.check_integration()
+            
+        except FileNotFoundError as e:
+            print(f"Erro fatal: {e}")
+            self.quit()
+
+    def check_integration(self):
+        if is_running_as_appimage() and not is_installed():
+            dialog = Gtk.MessageDialog(
+                transient_for=self.win,
+                modal=True,
+                message_type=Gtk.MessageType.QUESTION,
+                buttons=Gtk.ButtonsType.YES_NO,
+                text="Integrar ao Sistema?"
+            )
+            dialog.props.secondary_text = "O Steam Pass está rodando como AppImage.\nDeseja adicionar um atalho ao menu de aplicativos?"
+            dialog.connect("response", self.on_integration_response)
+            dialog.present()
+
+    def on_integration_response(self, dialog, response_id):
+        dialog.destroy()
+        if response_id == Gtk.ResponseType.YES:
+            if install_appimage():
+                print("Integração concluída.")
+            else:
+                print("Falha na integração.")
+
+
+def run(argv):
+    app = SteamPassApp()
+    return app.run(argv)
@@ -0,0 +1,123 @@
+import os
+import queue
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import gi
+
+gi.require_version('Gdk', '4.0')
+gi.require_version('GdkPixbuf', '2.0')
+from gi.repository import Gdk, GdkPixbuf, GLib
+
+# Tamanho padrão das miniaturas, em pixels
+THUMBNAIL_SIZE = 32
+
+
+class AvatarCache:
+    """
+    Carrega os avatares das contas (``config/avatarcache/<steamid>.png`` da Steam).
+
+    A decodificação e a redução acontecem numa thread separada. As texturas prontas
+    ficam num LRU por (SteamID, tamanho) e as miniaturas são gravadas no cache do
+    usuário (XDG), para que as próximas aberturas não precisem decodificar o original.
+    """
+
+    def __init__(self, avatar_dir, max_textures=256):
+        self.avatar_dir = Path(avatar_dir)
+        self.thumbnail_dir = Path(GLib.get_user_cache_dir()) / "steam-pass" / "avatars"
+        self.max_textures = max_textures
+
+        # (steam_id, tamanho) -> Gdk.Texture, ou None se a conta não tem avatar
+        self._textures = OrderedDict()
+        # (steam_id, tamanho) -> callbacks esperando o carregamento
+        self._waiting = {}
+
+        # LIFO: as linhas pedidas por último (as visíveis agora) são atendidas primeiro
+        self._requests = queue.LifoQueue()
+        self._worker = None
+
+    def lookup(self, steam_id, size=THUMBNAIL_SIZE):
+        """
+        Retorna ``(encontrado, textura)`` sem bloquear. A textura é None quando a
+        conta não tem avatar.
+        """
+        key = (steam_id, size)
+        if key not in self._textures:
+            return False, None
+        self._textures.move_to_end(key)
+        return True, self._textures[key]
+
+    def request(self, steam_id, callback, size=THUMBNAIL_SIZE):
+        """
+        Agenda o carregamento do avatar. ``callback(steam_id, textura)`` é chamado
+        na thread principal quando ele estiver pronto.
+        """
+        key = (steam_id, size)
+        callbacks = self._waiting.get(key)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return
+
+        self._waiting[key] = [callback]
+        self._requests.put(key)
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            key = self._requests.get()
+            try:
+                texture = self._load(*key)
+            except Exception as e:
+                print(f"Erro ao carregar avatar de {key[0]}: {e}")
+                texture = None
+            GLib.idle_add(self._on_loaded, key, texture)
+
+    def _on_loaded(self, key, texture):
+        self._textures[key] = texture
+        self._textures.move_to_end(key)
+        while len(self._textures) > self.max_textures:
+            self._textures.popitem(last=False)
+
+        for callback in self._waiting.pop(key, ()):
+            callback(key[0], texture)
+        return GLib.SOURCE_REMOVE
+
+    def _load(self, steam_id, size):
+        """Roda na thread do worker: usa a miniatura em cache ou gera uma nova."""
+        source = self.avatar_dir / f"{steam_id}.png"
+        try:
+            source_mtime = source.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        # A miniatura recebe o mtime do original; se forem diferentes, está velha
+        thumbnail = self.thumbnail_dir / str(size) / f"{steam_id}.png"
+        try:
+            if thumbnail.stat().st_mtime_ns == source_mtime:
+                return Gdk.Texture.new_from_filename(str(thumbnail))
+        except (FileNotFoundError, GLib.Error):
+            pass
+
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(str(source), size, size, True)
+        try:
+            self._save_thumbnail(pixbuf, thumbnail, source_mtime)
+        except (OSError, GLib.Error) as e:
+            print(f"Não foi possível salvar a miniatura de {steam_id}: {e}")
+        return Gdk.Texture.new_for_pixbuf(pixbuf)
+
+    def _save_thumbnail(self, pixbuf, thumbnail, source_mtime):
+        thumbnail.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{thumbnail.name}.", suffix=".tmp", dir=thumbnail.parent)
+        os.close(fd)
+        try:
+            pixbuf.savev(tmp_path, "png", [], [])
+            os.utime(tmp_path, ns=(source_mtime, source_mtime))
+            os.replace(tmp_path, thumbnail)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,110 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from datetime import timedelta
+
+from utils.steam_manager import SteamManager
+
+# Subcomandos tratados aqui, sem carregar o GTK
+COMMANDS = ('list', 'switch', 'remove', 'prune')
+
+
+def _days(value):
+    """Tipo do --days: inteiro de 1 até o maior timedelta possível."""
+    try:
+        days = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido: {value!r}")
+    if days < 1:
+        raise argparse.ArgumentTypeError("o número de dias deve ser pelo menos 1")
+    if days > timedelta.max.days:
+        raise argparse.ArgumentTypeError(f"o número de dias deve ser no máximo {timedelta.max.days}")
+    return days
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog='steam-pass',
+        description='Gerenciador de contas Steam. Sem subcomando, abre a interface gráfica.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_list = subparsers.add_parser('list', help='lista as contas salvas')
+    parser_list.add_argument('--json', action='store_true', help='imprime a lista em JSON')
+    parser_list.add_argument('--sort', choices=('recent', 'name', 'pinned'), default='recent',
+                             help='ordem da lista (padrão: último login primeiro)')
+    parser_list.add_argument('--limit', type=int, metavar='N', help='mostra só as N primeiras contas')
+
+    parser_switch = subparsers.add_parser('switch', help='troca a conta de login automático')
+    parser_switch.add_argument('account', help='nome da conta (AccountName)')
+    parser_switch.add_argument('--no-launch', action='store_true',
+                               help='não abre a Steam depois da troca')
+
+    parser_remove = subparsers.add_parser('remove', help='remove contas salvas')
+    parser_remove.add_argument('accounts', nargs='+', help='nomes das contas (AccountName)')
+
+    parser_prune = subparsers.add_parser('prune', help='remove contas sem login há muito tempo')
+    parser_prune.add_argument('--days', type=_days, required=True,
+                              help='remove as contas sem login há mais de DAYS dias')
+    return parser
+
+
+def _list(manager, as_json, order, limit):
+    if limit is None:
+        users = manager.get_users(order)
+    else:
+        users = manager.get_recent_users(max(limit, 0), order)
+
+    if as_json:
+        return json.dumps([user.as_dict() for user in users], ensure_ascii=False, indent=2)
+    return "\n".join(f"{user.account_name}\t{user.persona_name}" for user in users)
+
+
+def _switch(manager, account, launch):
+    user = next((u for u in manager.get_users() if u.account_name.lower() == account.lower()), None)
+    if user is None:
+        print(f"Conta não encontrada: {account}")
+        return 1
+
+    if manager.is_steam_running():
+        print("Fechando a Steam...")
+        if not manager.kill_steam():
+            print("A Steam não fechou a tempo.")
+            return 1
+
+    manager.set_active_user(user.account_name)
+    if launch:
+        manager.launch_steam()
+    return 0
+
+
+def run_cli(argv):
+    args = _build_parser().parse_args(argv)
+    output = None
+
+    # As mensagens do SteamManager vão para o stderr; o stdout fica só com o resultado
+    with redirect_stdout(sys.stderr):
+        try:
+            manager = SteamManager()
+        except FileNotFoundError as e:
+            print(f"Erro fatal: {e}")
+            return 1
+
+        if args.command == 'list':
+            output = _list(manager, args.json, args.sort, args.limit)
+            status = 0
+        elif args.command == 'switch':
+            status = _switch(manager, args.account, not args.no_launch)
+        else:
+            if args.command == 'remove':
+                removed = manager.remove_users(args.accounts)
+                status = 0 if removed else 1
+            else:
+                removed = manager.prune_users(older_than=timedelta(days=args.days))
+                status = 0
+            output = "\n".join(removed)
+
+    if output:
+        print(output)
+    return status
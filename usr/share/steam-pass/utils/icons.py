@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import gi
+
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk, Gio
+
+# Ícones simbólicos que vêm junto com o app (icons/hicolor/scalable/status) e o
+# tamanho em que são usados: o avatar nas linhas, os outros dentro de botões
+BUNDLED_ICONS = {
+    'avatar-default-symbolic': 32,
+    'window-close-symbolic': 16,
+    'list-add-symbolic': 16,
+}
+
+
+class IconRegistry:
+    """
+    Paintables dos ícones do app, carregados uma vez na inicialização.
+
+    Cada SVG é lido e rasterizado uma única vez; todas as linhas da lista usam o
+    mesmo paintable. Como são Gtk.IconPaintable, continuam sendo recoloridos
+    conforme o tema (ícones simbólicos).
+    """
+
+    def __init__(self, icons_dir, scale=1):
+        self.icons_dir = Path(icons_dir)
+        self._paintables = {}
+
+        for name, size in BUNDLED_ICONS.items():
+            path = self.icons_dir / "hicolor" / "scalable" / "status" / f"{name}.svg"
+            if path.exists():
+                paintable = Gtk.IconPaintable.new_for_file(Gio.File.new_for_path(str(path)), size, scale)
+            else:
+                paintable = None
+            self._paintables[name] = paintable
+
+    def image(self, name):
+        """Gtk.Image com o ícone; cai no tema do sistema se o SVG não existir."""
+        paintable = self._paintables.get(name)
+        if paintable is None:
+            return Gtk.Image.new_from_icon_name(name)
+        return Gtk.Image.new_from_paintable(paintable)
+
+    def button(self, name):
+        """Equivalente ao Gtk.Button.new_from_icon_name, usando o paintable compartilhado."""
+        button = Gtk.Button(child=self.image(name))
+        button.add_css_class("image-button")
+        return button
@@ -0,0 +1,103 @@
+import os
+import select
+import signal
+import time
+
+# Intervalo usado quando pidfd_open não está disponível
+POLL_INTERVAL = 0.05
+
+
+def find_pids(name):
+    """Lista os PIDs cujo nome de processo é exatamente ``name`` (como ``pgrep -x``)."""
+    # O kernel corta o nome do processo em 15 caracteres
+    name = name[:15]
+    pids = []
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry.name}/comm', 'rb') as f:
+                comm = f.read().rstrip(b'\n').decode('utf-8', 'replace')
+        except OSError:
+            continue
+        if comm == name:
+            pids.append(int(entry.name))
+    return pids
+
+
+def is_alive(pid):
+    """Verifica em /proc se o processo ainda existe (zumbis contam como encerrados)."""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+    except OSError:
+        return False
+    # O estado vem logo depois do nome, que fica entre parênteses
+    return stat[stat.rfind(b')') + 2:][:1] not in (b'Z', b'X')
+
+
+def terminate(pids, sig=signal.SIGTERM):
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _open_pidfds(pids):
+    pidfds = {}
+    for pid in pids:
+        try:
+            pidfds[os.pidfd_open(pid)] = pid
+        except ProcessLookupError:
+            pass
+    return pidfds
+
+
+def wait_for_exit(pids, timeout):
+    """
+    Espera os processos terminarem. Retorna ``True`` se todos saíram antes do timeout.
+
+    Usa pidfd_open + poll quando o kernel suporta; senão consulta o /proc.
+    """
+    deadline = time.monotonic() + timeout
+
+    try:
+        pidfds = _open_pidfds(pids)
+    except (AttributeError, OSError):
+        pidfds = None
+
+    if pidfds is not None:
+        try:
+            poller = select.poll()
+            for fd in pidfds:
+                poller.register(fd, select.POLLIN)
+
+            remaining = len(pidfds)
+            while remaining:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return False
+                for fd, _ in poller.poll(wait * 1000):
+                    poller.unregister(fd)
+                    remaining -= 1
+            return True
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+
+    pids = [pid for pid in pids if is_alive(pid)]
+    while pids:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+        pids = [pid for pid in pids if is_alive(pid)]
+    return True
+
+
+def stop_process(name, timeout):
+    """Envia SIGTERM para os processos ``name`` e espera todos saírem."""
+    pids = find_pids(name)
+    terminate(pids)
+    return wait_for_exit(pids, timeout)
+
@@ -0,0 +1,99 @@
+import unicodedata
+
+# Tamanho dos n-gramas indexados
+NGRAM_SIZE = 3
+
+
+def normalize(text):
+    """Minúsculas e sem acentos, para que "jose" encontre "José"."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _ngrams(text):
+    """Todos os pedaços de NGRAM_SIZE caracteres do texto."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Índice de trigramas sobre o AccountName e o PersonaName das contas.
+
+    Buscas de três ou mais caracteres cruzam os conjuntos dos trigramas do texto
+    e só confirmam os candidatos; as mais curtas casam com quase todas as contas,
+    então comparam direto com os nomes normalizados. O índice é atualizado de
+    forma incremental: ``update`` só mexe nas contas que mudaram.
+    """
+
+    def __init__(self):
+        # n-grama -> SteamIDs cujos nomes o contêm
+        self._grams = {}
+        # SteamID -> (registro indexado, textos normalizados, n-gramas)
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, users):
+        """Sincroniza o índice com a lista de UserRecords."""
+        users = {user.steam_id: user for user in users}
+
+        for steam_id in [s for s in self._entries if s not in users]:
+            self.remove(steam_id)
+        for steam_id, user in users.items():
+            entry = self._entries.get(steam_id)
+            if entry is None or entry[0] != user:
+                self.add(user)
+
+    def add(self, user):
+        if user.steam_id in self._entries:
+            self.remove(user.steam_id)
+
+        texts = (normalize(user.account_name), normalize(user.persona_name))
+        grams = _ngrams(texts[0]) | _ngrams(texts[1])
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(user.steam_id)
+        self._entries[user.steam_id] = (user, texts, grams)
+
+    def remove(self, steam_id):
+        _, _, grams = self._entries.pop(steam_id)
+        for gram in grams:
+            ids = self._grams[gram]
+            ids.discard(steam_id)
+            if not ids:
+                del self._grams[gram]
+
+    def search(self, query):
+        """
+        SteamIDs das contas cujo AccountName ou PersonaName contém ``query``
+        (sem diferenciar maiúsculas e acentos). None se a busca estiver vazia.
+        """
+        query = normalize(query.strip())
+        if not query:
+            return None
+
+        if len(query) < NGRAM_SIZE:
+            return {
+                steam_id for steam_id, (_, texts, _) in self._entries.items()
+                if query in texts[0] or query in texts[1]
+            }
+
+        # Começa pelo trigrama mais raro para manter as interseções pequenas
+        trigrams = sorted(
+            (self._grams.get(query[i:i + NGRAM_SIZE], set()) for i in range(len(query) - NGRAM_SIZE + 1)),
+            key=len,
+        )
+        candidates = set(trigrams[0])
+        if len(trigrams) == 1:
+            # A busca é o próprio trigrama: não há o que confirmar
+            return candidates
+        for ids in trigrams[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+
+        # Os trigramas podem estar em posições diferentes: confirma a substring
+        return {
+            steam_id for steam_id in candidates
+            if any(query in text for text in self._entries[steam_id][1])
+        }
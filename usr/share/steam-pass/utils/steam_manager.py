@@ -0,0 +1,492 @@
+import os
+import subprocess
+import threading
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import vdf
+
+from utils.storage import WriteBatch, atomic_write
+from utils.process import find_pids, stop_process
+from utils.users import UserRecord, sort_users, top_users
+
+# Campos de cada conta do loginusers.vdf usados pelo app (chave em minúsculas -> nome)
+USER_FIELDS = {name.lower(): name for name in ('AccountName', 'PersonaName', 'Timestamp', 'MostRecent')}
+
+# Versão do formato do snapshot da lista de contas; snapshots de outra versão são ignorados
+SNAPSHOT_VERSION = 2
+
+
+def _user_cache_dir():
+    """Diretório de cache do app: $XDG_CACHE_HOME/steam-pass (padrão ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base or not os.path.isabs(base):
+        base = Path.home() / ".cache"
+    return Path(base) / "steam-pass"
+
+
+class SteamManager:
+    """Gerencia a localização e modificação dos arquivos da Steam."""
+    
+    def __init__(self):
+        self.steam_root = self._find_steam_root()
+        if not self.steam_root:
+            fallback = Path.home() / ".local" / "share" / "Steam"
+            if fallback.exists():
+                self.steam_root = fallback
+            else:
+                raise FileNotFoundError("Diretório da Steam não encontrado.")
+            
+        self.config_path = self.steam_root / "config" / "loginusers.vdf"
+        # Avatares baixados pela Steam, um <steamid>.png por conta
+        self.avatar_dir = self.steam_root / "config" / "avatarcache"
+        self.steam_exe = "steam" 
+        
+        self.registry_file = None
+        self.mode = "registry"
+
+        if (self.steam_root / "registry.vdf").exists():
+            self.registry_file = self.steam_root / "registry.vdf"
+        elif (self.steam_root.parent / "registry.vdf").exists():
+            self.registry_file = self.steam_root.parent / "registry.vdf"
+        else:
+            print("registry.vdf não encontrado. Usando config/config.vdf (Modo Moderno).")
+            self.registry_file = self.steam_root / "config" / "config.vdf"
+            self.mode = "config_store"
+
+        # A interface lê a lista numa thread separada: os caches só são usados com o lock
+        self._lock = threading.Lock()
+        # Cache dos arquivos já lidos: caminho -> (assinatura, árvore)
+        self._vdf_cache = {}
+        # Última lista de contas lida: (assinatura do loginusers.vdf, UserRecords na ordem do arquivo)
+        self._users_cache = None
+        # Cópia da lista em VDF binário, para mostrar as contas sem ler o loginusers.vdf
+        self.snapshot_path = _user_cache_dir() / "users.bin"
+
+    def _find_steam_root(self):
+        possible_paths = [
+            Path.home() / ".steam" / "steam",
+            Path.home() / ".local" / "share" / "Steam",
+            Path.home() / ".var" / "app" / "com.valvesoftware.Steam" / ".steam" / "steam"
+        ]
+        
+        for path in possible_paths:
+            if path.exists() and (path / "config").exists():
+                return path
+        return None
+
+    def _get_case_insensitive_dict(self, dictionary, key):
+        """
+        Retorna o sub-dicionário da chave, criando-o se não existir.
+
+        O sub-dicionário é copiado antes de ser devolvido (copy-on-write), para que
+        alterações não afetem as árvores guardadas no cache.
+        """
+        if key in dictionary:
+            dictionary[key] = dictionary[key].copy()
+        else:
+            dictionary[key] = vdf.CaseInsensitiveDict()
+        return dictionary[key]
+
+    def _file_signature(self, path):
+        return self._stat_signature(path.stat())
+
+    def _stat_signature(self, st):
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load_vdf(self, path):
+        """
+        Lê o arquivo usando o cache enquanto ele não mudar no disco. A árvore
+        devolvida é compartilhada: não deve ser alterada.
+
+        As chaves são case-insensitive, como na Steam, mas mantêm a grafia original.
+        """
+        signature = self._file_signature(path)
+
+        cached = self._vdf_cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = vdf.load(f, mapper=vdf.CaseInsensitiveDict)
+        self._vdf_cache[path] = (signature, data)
+        return data
+
+    def _remember_vdf(self, path, data, st):
+        """
+        Atualiza o cache com a árvore que acabamos de gravar. ``st`` é o stat do
+        arquivo que gravamos (do WriteBatch.commit), e não um stat novo: se a Steam
+        regravar o arquivo logo depois, a nossa árvore não pode ficar com a
+        assinatura da versão dela.
+        """
+        self._vdf_cache[path] = (self._stat_signature(st), data)
+
+    def _forget_vdf(self, path):
+        self._vdf_cache.pop(path, None)
+
+    def get_users(self, order='recent'):
+        """
+        Lista de UserRecords. ``order`` é 'recent' (último login primeiro), 'name'
+        ou 'pinned' (a conta do último login fixada no topo, o resto por data).
+        """
+        return sort_users(self._get_records(), order)
+
+    def get_recent_users(self, k, order='recent'):
+        """As ``k`` primeiras contas na ordem pedida, sem ordenar a lista inteira."""
+        return top_users(self._get_records(), k, order)
+
+    def _get_records(self):
+        with self._lock:
+            return self._get_records_locked()
+
+    def _get_records_locked(self):
+        try:
+            # Um único stat: ele também diz se o arquivo existe
+            try:
+                signature = self._file_signature(self.config_path)
+            except FileNotFoundError:
+                return []
+            if self._users_cache and self._users_cache[0] == signature:
+                return self._users_cache[1]
+
+            snapshot = self._read_snapshot()
+            if snapshot and snapshot[0] == signature:
+                records = snapshot[1]
+            else:
+                records = self._read_users()
+                self._write_snapshot(signature, records)
+            # Os registros são imutáveis, então a lista pode ser compartilhada
+            self._users_cache = (signature, records)
+            return records
+        except Exception as e:
+            print(f"Erro ao ler usuários: {e}")
+            return []
+
+    def get_snapshot_users(self, order='recent'):
+        """
+        Lista de contas da última leitura, direto do snapshot em cache, sem tocar
+        no loginusers.vdf. Pode estar desatualizada; None se não houver snapshot.
+        """
+        snapshot = self._read_snapshot()
+        if snapshot is None:
+            return None
+        return sort_users(snapshot[1], order)
+
+    def _read_snapshot(self):
+        """Retorna (assinatura do loginusers.vdf, lista) do snapshot, ou None."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = vdf.binary_load(f)['snapshot']
+
+            if data['version'] != SNAPSHOT_VERSION or data['source'] != str(self.config_path):
+                return None
+
+            signature = (data['mtime'], data['size'], data['inode'])
+            records = [
+                UserRecord(steam_id, user['AccountName'], user['PersonaName'],
+                           int(user['Timestamp']), bool(user['MostRecent']))
+                for steam_id, user in data['users'].items()
+            ]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Snapshot da lista de contas inválido: {e}")
+            return None
+
+        return (signature, records)
+
+    def _write_snapshot(self, signature, records):
+        mtime, size, inode = signature
+        users = {}
+        for record in records:
+            users[record.steam_id] = {
+                'AccountName': record.account_name,
+                'PersonaName': record.persona_name,
+                'Timestamp': vdf.INT_64(record.timestamp),
+                'MostRecent': int(record.most_recent),
+            }
+
+        data = {'snapshot': {
+            'version': SNAPSHOT_VERSION,
+            'source': str(self.config_path),
+            'mtime': vdf.UINT_64(mtime),
+            'size': vdf.UINT_64(size),
+            'inode': vdf.UINT_64(inode),
+            'users': users,
+        }}
+
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            # O snapshot é só um cache conferido pela assinatura: sem fsync, que em
+            # homes via NFS custaria caro a cada atualização da lista
+            atomic_write(self.snapshot_path, vdf.binary_dumps(data), sync=False)
+        except Exception as e:
+            print(f"Não foi possível salvar o snapshot da lista de contas: {e}")
+
+    def _read_users(self):
+        """
+        Lê só os campos usados de cada conta do bloco 'users' do loginusers.vdf,
+        sem montar a árvore do arquivo e parando assim que o bloco fecha.
+        Retorna UserRecords na ordem do arquivo.
+        """
+        users = {}
+        user = None
+        in_users = False
+
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            for event, key, value, depth in vdf.iterparse(f):
+                if depth == 0:
+                    if event == 'start' and key.lower() == 'users':
+                        in_users = True
+                    elif event == 'end' and in_users:
+                        break
+                elif not in_users:
+                    continue
+                elif depth == 1 and event == 'start':
+                    # A chave do bloco é o SteamID
+                    user = users.setdefault(key, {})
+                elif depth == 1:
+                    user = None
+                elif depth == 2 and event == 'value' and user is not None:
+                    field = USER_FIELDS.get(key.lower())
+                    if field:
+                        user[field] = value
+
+        return [UserRecord.from_vdf(steam_id, fields) for steam_id, fields in users.items()]
+
+    def _update_users_cache(self, old_signature, removed_ids, signature, data):
+        """
+        Atualiza a lista de contas (e o snapshot) depois de gravarmos o loginusers.vdf,
+        sem ler o arquivo de novo: a próxima get_users só precisa do stat.
+        """
+        if self._users_cache and self._users_cache[0] == old_signature:
+            removed_ids = set(removed_ids)
+            records = [record for record in self._users_cache[1] if record.steam_id not in removed_ids]
+        else:
+            # A lista em cache é de outra versão do arquivo: monta a partir da árvore gravada
+            records = [UserRecord.from_vdf(steam_id, fields)
+                       for steam_id, fields in data.get('users', {}).items()
+                       if isinstance(fields, Mapping)]
+
+        self._users_cache = (signature, records)
+        self._write_snapshot(signature, records)
+
+    def remove_user(self, account_name):
+        """Remove o usuário do loginusers.vdf e do registro/config."""
+        return self.remove_users([account_name])
+
+    def remove_users(self, account_names):
+        """Remove várias contas de uma vez. Retorna as contas removidas."""
+        return self.apply([('remove', name) for name in account_names])
+
+    def prune_users(self, older_than):
+        """
+        Remove as contas cujo último login é anterior a ``older_than``.
+
+        ``older_than`` pode ser um ``datetime`` ou um ``timedelta`` (idade a partir de agora).
+        Retorna as contas removidas. Levanta ValueError se o limite não estiver no
+        passado, o que apagaria todas as contas.
+        """
+        now = datetime.now()
+        if isinstance(older_than, timedelta):
+            if older_than <= timedelta(0):
+                raise ValueError(f"Idade inválida para remover contas: {older_than}")
+            try:
+                older_than = now - older_than
+            except OverflowError:
+                # Antes do ano 1: nenhuma conta pode ser tão antiga
+                return []
+        limit = older_than.timestamp()
+        if limit > now.timestamp():
+            raise ValueError(f"Data limite no futuro: {older_than}")
+
+        stale = [user.account_name for user in self.get_users() if user.timestamp < limit]
+
+        return self.remove_users(stale) if stale else []
+
+    def apply(self, ops):
+        """
+        Aplica várias operações lendo cada arquivo uma vez e gravando tudo junto no final.
+
+        ``ops`` é uma lista de tuplas ``('remove', conta)`` ou ``('set_active', conta)``.
+        Se houver mais de um ``set_active``, vale o último. Retorna as contas removidas.
+        """
+        with self._lock:
+            return self._apply_locked(ops)
+
+    def _apply_locked(self, ops):
+        removals = []
+        active = None
+        for op, account_name in ops:
+            if op == 'remove':
+                removals.append(account_name)
+            elif op == 'set_active':
+                active = account_name
+            else:
+                raise ValueError(f"Operação desconhecida: {op}")
+
+        for account_name in removals:
+            print(f"Removendo usuário: {account_name}")
+
+        batch = WriteBatch()
+        written = {}
+        removed = []
+        # SteamIDs apagados do loginusers.vdf e a assinatura da versão lida
+        removed_ids = []
+        users_signature = None
+        removed_from_registry = False
+        registry_text = None
+
+        # 1. Remover de loginusers.vdf
+        if removals and self.config_path.exists():
+            try:
+                data = self._load_vdf(self.config_path).copy()
+                users_signature = self._vdf_cache[self.config_path][0]
+                users = self._get_case_insensitive_dict(data, 'users')
+                # A chave é o SteamID, precisamos achar quais SteamIDs pertencem às contas
+                wanted = {name.lower() for name in removals}
+                targets = [sid for sid, info in users.items()
+                           if info.get('AccountName', '').lower() in wanted]
+
+                if targets:
+                    for sid in targets:
+                        removed.append(users[sid].get('AccountName'))
+                        del users[sid]
+                    removed_ids = targets
+                    batch.write(self.config_path, vdf.dumps(data, pretty=True))
+                    written[self.config_path] = data
+            except Exception as e:
+                print(f"Erro ao remover de loginusers.vdf: {e}")
+
+        # 2. Remover do registry/config
+        if removals and self.registry_file and self.registry_file.exists():
+            try:
+                data = self._load_vdf(self.registry_file).copy()
+                accounts = self._accounts_for_write(data)
+
+                found = False
+                removed_folded = {name.lower() for name in removed}
+                for account_name in removals:
+                    # A busca da chave do usuário já é case insensitive
+                    if account_name in accounts:
+                        del accounts[account_name]
+                        found = True
+                        if account_name.lower() not in removed_folded:
+                            removed.append(account_name)
+                    else:
+                        print(f"Usuário não encontrado em 'Accounts': {account_name}")
+
+                if found:
+                    registry_text = vdf.dumps(data, pretty=True)
+                    written[self.registry_file] = data
+                    removed_from_registry = True
+            except Exception as e:
+                print(f"Erro ao remover do registro: {e}")
+
+        # 3. Conta de login automático, aplicada sobre o texto que será gravado
+        if active is not None:
+            patched = self._patch_active_user(active, registry_text)
+            if patched is not None:
+                registry_text = patched
+                # O texto gravado não corresponde mais à árvore em memória
+                written.pop(self.registry_file, None)
+
+        if registry_text is not None:
+            batch.write(self.registry_file, registry_text)
+
+        try:
+            stats = batch.commit()
+        except Exception as e:
+            print(f"Erro ao gravar alterações: {e}")
+            return []
+
+        for path, data in written.items():
+            self._remember_vdf(path, data, stats[path])
+        if self.config_path in written:
+            self._update_users_cache(users_signature, removed_ids,
+                                     self._stat_signature(stats[self.config_path]),
+                                     written[self.config_path])
+        if registry_text is not None and self.registry_file not in written:
+            self._forget_vdf(self.registry_file)
+
+        if removed_from_registry:
+            print("Removido do registro com sucesso.")
+        if active is not None and registry_text is not None:
+            print(f"Sucesso: Usuário '{active}' definido em {self.registry_file}")
+        return removed
+
+    def _accounts_for_write(self, data):
+        """Navega (com copy-on-write) até o bloco 'Accounts' do registro/config."""
+        root_key = 'Registry' if self.mode == 'registry' else 'InstallConfigStore'
+
+        root = self._get_case_insensitive_dict(data, root_key)
+        if self.mode == 'registry':
+            hkcu = self._get_case_insensitive_dict(root, 'HKCU')
+            software = self._get_case_insensitive_dict(hkcu, 'Software')
+        else:
+            # ConfigStore geralmente é InstallConfigStore -> Software
+            software = self._get_case_insensitive_dict(root, 'Software')
+
+        valve = self._get_case_insensitive_dict(software, 'Valve')
+        steam = self._get_case_insensitive_dict(valve, 'Steam')
+        return self._get_case_insensitive_dict(steam, 'Accounts')
+
+    def _patch_active_user(self, account_name, text=None):
+        """
+        Devolve ``text`` (ou o conteúdo atual do arquivo) com a conta de login automático
+        trocada. Retorna None se não for possível.
+        """
+        if not self.registry_file or not self.registry_file.exists():
+            print(f"Arquivo de configuração não encontrado: {self.registry_file}")
+            if self.mode == "config_store":
+                 self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+                 atomic_write(self.registry_file, '"InstallConfigStore"\n{\n\t"Software"\n\t{\n\t\t"Valve"\n\t\t{\n\t\t\t"Steam"\n\t\t\t{\n\t\t\t}\n\t\t}\n\t}\n}')
+
+        if self.mode == "registry":
+            steam_path = ['Registry', 'HKCU', 'Software', 'Valve', 'Steam']
+        else:
+            steam_path = ['InstallConfigStore', 'Software', 'Valve', 'Steam']
+
+        # Altera só os valores necessários, mantendo o resto do arquivo intacto
+        values = {
+            'AutoLoginUser': account_name,
+            'RememberPassword': '1' if account_name else '0',
+            'AlreadyLoggedIn': '0',
+        }
+
+        try:
+            if text is None:
+                with open(self.registry_file, 'r', encoding='utf-8', newline='') as f:
+                    text = f.read()
+
+            try:
+                return vdf.patches(text, steam_path, values, case_insensitive=True)
+            except SyntaxError:
+                print(f"Erro estrutural no {self.registry_file.name}")
+                return None
+
+        except Exception as e:
+            print(f"Erro ao escrever no arquivo de configuração: {e}")
+            return None
+
+    def set_active_user(self, account_name):
+        self.apply([('set_active', account_name)])
+
+    def reset_login(self):
+        self.set_active_user("")
+
+    def is_steam_running(self):
+        return bool(find_pids("steam"))
+
+    def launch_steam(self):
+        subprocess.Popen([self.steam_exe], start_new_session=True, 
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def kill_steam(self, timeout=3.0):
+        """Fecha a Steam e espera ela sair. Retorna True se saiu dentro do timeout."""
+        try:
+            return stop_process("steam", timeout)
+        except Exception as e:
+            print(f"Erro ao fechar Steam: {e}")
+            return False
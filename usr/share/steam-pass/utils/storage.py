@@ -0,0 +1,121 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def _write_temp(path, data, sync=True):
+    """
+    Grava ``data`` num arquivo temporário ao lado de ``path`` e faz fsync
+    (se ``sync``). Retorna o caminho do temporário e o seu ``os.fstat``.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        # Mantém as permissões do arquivo original
+        try:
+            os.fchmod(fd, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if sync:
+            os.fsync(fd)
+        st = os.fstat(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+
+    os.close(fd)
+    return tmp_path, st
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteBatch:
+    """
+    Agrupa as escritas de uma operação lógica e confirma todas de uma vez.
+
+    Cada arquivo é serializado num único buffer, gravado num temporário no mesmo
+    diretório, sincronizado com fsync e só então renomeado por cima do original.
+    Se algo falhar antes dos renames, nenhum arquivo é alterado.
+
+    Com ``sync=False`` não há fsync (nem dos arquivos nem do diretório): a troca
+    continua atômica, mas pode se perder numa queda do sistema. Serve para caches
+    que podem ser refeitos.
+    """
+
+    def __init__(self, sync=True):
+        self._pending = {}
+        self.sync = sync
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def write(self, path, text, encoding='utf-8'):
+        """
+        Agenda a escrita de ``text`` em ``path``. A última escrita vence.
+
+        ``text`` pode ser ``bytes``, gravado como está.
+        """
+        self._pending[Path(path)] = text if isinstance(text, bytes) else text.encode(encoding)
+
+    def discard(self):
+        self._pending.clear()
+
+    def commit(self):
+        """
+        Grava e sincroniza todos os temporários e depois renomeia cada um.
+
+        Retorna ``{caminho: os.stat_result}`` com o stat de cada arquivo gravado,
+        tirado antes do rename (inode e mtime não mudam com ``os.replace``). Assim
+        quem chamou sabe qual versão do arquivo é a sua, mesmo que outro processo
+        o substitua logo depois.
+        """
+        pending, self._pending = self._pending, {}
+        temps = []
+        try:
+            for path, data in pending.items():
+                # Segue links simbólicos para não substituir o próprio link
+                target = Path(os.path.realpath(path))
+                tmp_path, st = _write_temp(target, data, self.sync)
+                temps.append((tmp_path, target, path, st))
+        except BaseException:
+            for tmp_path, *_ in temps:
+                os.unlink(tmp_path)
+            raise
+
+        for tmp_path, target, *_ in temps:
+            os.replace(tmp_path, target)
+
+        if self.sync:
+            for directory in {target.parent for _, target, *_ in temps}:
+                _fsync_dir(directory)
+
+        return {path: st for _, _, path, st in temps}
+
+
+def atomic_write(path, text, encoding='utf-8', sync=True):
+    """Escreve ``text`` em ``path`` de forma atômica. Veja ``WriteBatch`` sobre ``sync``."""
+    with WriteBatch(sync) as batch:
+        batch.write(path, text, encoding)
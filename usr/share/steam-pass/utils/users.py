@@ -0,0 +1,87 @@
+import heapq
+from operator import attrgetter
+
+
+class UserRecord:
+    """
+    Uma conta do loginusers.vdf, com os campos já convertidos.
+
+    As chaves de ordenação são calculadas uma vez, na criação, para que ordenar ou
+    escolher as contas mais recentes não precise converter nada de novo.
+    """
+    __slots__ = ('steam_id', 'account_name', 'persona_name', 'timestamp', 'most_recent',
+                 'name_key', 'recent_key', 'pinned_key')
+
+    def __init__(self, steam_id, account_name='Desconhecido', persona_name='Desconhecido',
+                 timestamp=0, most_recent=False):
+        self.steam_id = steam_id
+        self.account_name = account_name
+        self.persona_name = persona_name
+        self.timestamp = timestamp
+        # Conta que a Steam marca como a do último login (MostRecent)
+        self.most_recent = most_recent
+
+        self.name_key = (account_name.casefold(), steam_id)
+        self.recent_key = (-timestamp, steam_id)
+        # A conta do último login fica fixada no topo, o resto por data
+        self.pinned_key = (not most_recent,) + self.recent_key
+
+    @classmethod
+    def from_vdf(cls, steam_id, fields):
+        """Cria o registro a partir dos valores (strings) de um bloco do loginusers.vdf."""
+        return cls(
+            steam_id,
+            fields.get('AccountName', 'Desconhecido'),
+            fields.get('PersonaName', 'Desconhecido'),
+            _parse_int(fields.get('Timestamp')),
+            _parse_int(fields.get('MostRecent')) != 0,
+        )
+
+    def _fields(self):
+        return (self.steam_id, self.account_name, self.persona_name, self.timestamp, self.most_recent)
+
+    def __eq__(self, other):
+        if not isinstance(other, UserRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"UserRecord({self.steam_id!r}, {self.account_name!r}, {self.persona_name!r}, {self.timestamp!r})"
+
+    def as_dict(self):
+        """Os campos com os nomes usados pela Steam, para saída em JSON."""
+        return {
+            'steam_id': self.steam_id,
+            'AccountName': self.account_name,
+            'PersonaName': self.persona_name,
+            'Timestamp': self.timestamp,
+            'MostRecent': self.most_recent,
+        }
+
+
+# Ordenações disponíveis -> chave pré-calculada usada
+SORT_KEYS = {
+    'recent': attrgetter('recent_key'),
+    'name': attrgetter('name_key'),
+    'pinned': attrgetter('pinned_key'),
+}
+
+
+def sort_users(users, order='recent'):
+    """Retorna uma nova lista ordenada. ``order`` é uma das chaves de SORT_KEYS."""
+    return sorted(users, key=SORT_KEYS[order])
+
+
+def top_users(users, k, order='recent'):
+    """As ``k`` primeiras contas na ordem pedida, sem ordenar a lista toda."""
+    return heapq.nsmallest(k, users, key=SORT_KEYS[order])
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
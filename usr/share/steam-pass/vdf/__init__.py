@@ -4,12 +4,14 @@ Module for deserializing/serializing to and from VDF
 __version__ = "3.4"
 __author__ = "Rossen Georgiev"
 
+import os
 import re
 import sys
+import json
+import mmap
 import struct
 from binascii import crc32
 from io import BytesIO
-from io import StringIO as unicodeIO
 
 try:
     from collections.abc import Mapping
@@ -17,6 +19,8 @@ except:
     from collections import Mapping
 
 from vdf.vdict import VDFDict
+from vdf.compact import CompactDict
+from vdf.cidict import CaseInsensitiveDict
 
 # Py2 & Py3 compatibility
 if sys.version_info[0] >= 3:
@@ -27,7 +31,6 @@ if sys.version_info[0] >= 3:
     def strip_bom(line):
         return line.lstrip(BOMS)
 else:
-    from StringIO import StringIO as strIO
     string_type = basestring
     int_type = long
     BOMS = '\xef\xbb\xbf\xff\xfe\xfe\xff'
@@ -52,19 +55,168 @@ _unescape_char_map = {
 }
 _escape_char_map = {v: k for k, v in _unescape_char_map.items()}
 
+_escape_table = dict((ord(k), v) for k, v in _escape_char_map.items())
+_re_escape = re.compile(r"[\n\t\v\b\r\f\a\\\?\"']")
+_re_unescape = re.compile(r"(\\n|\\t|\\v|\\b|\\r|\\f|\\a|\\\\|\\\?|\\\"|\\')")
+
 def _re_escape_match(m):
     return _escape_char_map[m.group()]
 
 def _re_unescape_match(m):
     return _unescape_char_map[m.group()]
 
+# Most strings have nothing to escape, so they are returned as they are after a
+# quick check. translate() works on py2 unicode, but not on py2 str.
 def _escape(text):
-    return re.sub(r"[\n\t\v\b\r\f\a\\\?\"']", _re_escape_match, text)
+    if _re_escape.search(text) is None:
+        return text
+    if not isinstance(text, bytes):
+        return text.translate(_escape_table)
+    return _re_escape.sub(_re_escape_match, text)
 
 def _unescape(text):
-    return re.sub(r"(\\n|\\t|\\v|\\b|\\r|\\f|\\a|\\\\|\\\?|\\\"|\\')", _re_unescape_match, text)
+    if '\\' not in text:
+        return text
+    return _re_unescape.sub(_re_unescape_match, text)
 
 # parsing and dumping for KV1
+TOKEN_VALUE = 0
+TOKEN_OPEN = 1
+TOKEN_CLOSE = 2
+
+# Matches one line of KV1 text, starting at the beginning of the line.
+# Quoted strings may run over several lines, as the regex is applied to the whole
+# buffer instead of a single line.
+_re_line = re.compile(r'[^\S\n]*(?:'
+                      r'(?P<skip>/|(?=\n)|\Z)'
+                      r'|(?P<open>{)'
+                      r'|(?P<close>})'
+                      r'|(?:"(?P<qkey>[^\\"]*(?:\\.[^\\"]*)*)"|(?P<key>#?[a-z0-9\-\_\\\?$%<>]+))'
+                      r'([ \t]*('
+                      r'"(?P<qval>[^\\"]*(?:\\.[^\\"]*)*)(?P<vq_end>")?'
+                      r'|(?P<val>(?:(?<!/)/(?!/)|[a-z0-9\-\_\\\?\*\.$<> ])+)'
+                      r'|(?P<sblock>{[ \t]*)(?P<eblock>})?'
+                      r'))?'
+                      r')',
+                      flags=re.I)
+_re_indent = re.compile(r'[^\S\n]*')
+
+def _read_buffer(fp):
+    if hasattr(fp, 'read'):
+        return fp.read()
+    return ''.join(fp)
+
+def _fp_name(fp):
+    return getattr(fp, 'name', '<%s>' % fp.__class__.__name__)
+
+def _iter_tokens(buf, name='<str>'):
+    """
+    Tokenize ``buf`` (a ``str`` containing a VDF) in a single pass.
+
+    Yields ``(kind, key, value, start, end)`` tuples, where ``kind`` is one of
+    ``TOKEN_VALUE``, ``TOKEN_OPEN`` or ``TOKEN_CLOSE``. Keys and values are returned
+    as they appear in the text, without unescaping. ``start`` and ``end`` are the
+    offsets in ``buf`` of the value (including quotes), the key of an opened block,
+    or the closing bracket.
+
+    Raises ``SyntaxError`` exactly where ``parse`` would, with the same line numbers.
+    """
+    match = _re_line.match
+    find = buf.find
+    buf_len = len(buf)
+
+    # BOMs are only stripped from the first line
+    pos = find('\n')
+    if pos == -1:
+        pos = buf_len
+    pos -= len(strip_bom(buf[:pos]))
+
+    def line_at(pos, end=None):
+        pos = _re_indent.match(buf, pos).end()
+        if end is None:
+            end = find('\n', pos) + 1 or buf_len
+        return buf[pos:end].lstrip()
+
+    depth = 0
+    expect_bracket = False
+    lineno = 0
+    line_pos = pos
+
+    while pos < buf_len:
+        lineno += 1
+        line_pos = pos
+        m = match(buf, pos)
+
+        if m is not None:
+            skip, sopen, sclose, qkey, key, _, _, qval, vq_end, val, sblock, eblock = m.groups()
+
+            if skip is not None:
+                pos = m.end()
+            # one level deeper
+            elif sopen is not None:
+                expect_bracket = False
+                pos = m.end()
+            elif expect_bracket:
+                raise SyntaxError("vdf.parse: expected openning bracket",
+                                  (name, lineno, 1, line_at(pos)))
+            # one level back
+            elif sclose is not None:
+                if not depth:
+                    raise SyntaxError("vdf.parse: one too many closing parenthasis",
+                                      (name, lineno, 0, line_at(pos)))
+                depth -= 1
+                pos = m.end()
+                yield TOKEN_CLOSE, None, None, pos - 1, pos
+            # keyvalue pairs
+            else:
+                pos = m.end()
+                if qkey is not None:
+                    key = qkey
+
+                if qval is not None:
+                    if vq_end is None:
+                        raise SyntaxError("vdf.parse: unexpected EOF (open quote for value?)",
+                                          (name, lineno, 0, line_at(line_pos, buf_len)))
+                    val = qval
+                    vstart = pos - len(qval) - 2
+                    vend = pos
+                elif val is not None:
+                    vstart = pos - len(val)
+                    val = val.rstrip()
+                    vend = vstart + len(val)
+                    if val == "":
+                        val = None
+
+                # we have a key with no value, so a new block starts (level deeper)
+                if val is None:
+                    if qkey is None:
+                        kstart, kend = m.span('key')
+                    else:
+                        kstart, kend = m.start('qkey') - 1, m.end('qkey') + 1
+                    yield TOKEN_OPEN, key, None, kstart, kend
+                    if eblock is None:
+                        depth += 1
+                        # only expect a bracket if it's not already on the same line
+                        if sblock is None:
+                            expect_bracket = True
+                    else:
+                        yield TOKEN_CLOSE, None, None, pos - 1, pos
+                else:
+                    yield TOKEN_VALUE, key, val, vstart, vend
+        elif expect_bracket:
+            raise SyntaxError("vdf.parse: expected openning bracket",
+                              (name, lineno, 1, line_at(pos)))
+        else:
+            raise SyntaxError("vdf.parse: unexpected EOF (open key quote?)",
+                              (name, lineno, 0, line_at(pos, buf_len)))
+
+        # anything after the first token on a line is ignored
+        pos = find('\n', pos) + 1 or buf_len
+
+    if depth:
+        raise SyntaxError("vdf.parse: unclosed parenthasis or quotes (EOF)",
+                           (name, lineno, 0, line_at(line_pos, pos)))
+
 def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
     """
     Deserialize ``s`` (a ``str`` or ``unicode`` instance containing a VDF)
@@ -83,108 +235,224 @@ def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
     if not hasattr(fp, 'readline'):
         raise TypeError("Expected fp to be a file-like object supporting line iteration")
 
+    return _parse_buffer(_read_buffer(fp), _fp_name(fp), mapper, merge_duplicate_keys, escaped)
+
+
+def _parse_buffer(buf, name, mapper=dict, merge_duplicate_keys=True, escaped=True):
     stack = [mapper()]
-    expect_bracket = False
 
-    re_keyvalue = re.compile(r'^("(?P<qkey>(?:\\.|[^\\"])*)"|(?P<key>#?[a-z0-9\-\_\\\?$%<>]+))'
-                             r'([ \t]*('
-                             r'"(?P<qval>(?:\\.|[^\\"])*)(?P<vq_end>")?'
-                             r'|(?P<val>(?:(?<!/)/(?!/)|[a-z0-9\-\_\\\?\*\.$<> ])+)'
-                             r'|(?P<sblock>{[ \t]*)(?P<eblock>})?'
-                             r'))?',
-                             flags=re.I)
+    for kind, key, val, _, _ in _iter_tokens(buf, name):
+        if kind == TOKEN_CLOSE:
+            stack.pop()
+            continue
+
+        if escaped:
+            key = _unescape(key)
+
+        if kind == TOKEN_VALUE:
+            stack[-1][key] = _unescape(val) if escaped else val
+        else:
+            stack.append(_open_block(stack[-1], key, mapper, merge_duplicate_keys))
+
+    return stack.pop()
+
+
+def _open_block(parent, key, mapper, merge_duplicate_keys):
+    if merge_duplicate_keys and key in parent:
+        _m = parent[key]
+        # we've descended a level deeper, if value is str, we have to overwrite it to mapper
+        if not isinstance(_m, mapper):
+            _m = parent[key] = mapper()
+    else:
+        _m = mapper()
+        parent[key] = _m
+    return _m
+
+
+def load_path(fp, path, case_insensitive=False, mapper=dict, merge_duplicate_keys=True, escaped=True):
+    """
+    Deserialize only the value at ``path`` from ``fp`` (a ``.readline()``-supporting
+    file-like object containing a VDF).
+
+    ``path`` is a sequence of keys, e.g. ``["InstallConfigStore", "Software"]``.
+    Blocks that are not on the path are skipped by the tokenizer, without building
+    them. The result is the same as looking up ``path`` in the output of ``parse``.
 
-    for lineno, line in enumerate(fp, 1):
-        if lineno == 1:
-            line = strip_bom(line)
+    ``case_insensitive`` when ``True`` will match the keys in ``path`` ignoring
+    case. When several keys match, the first one in the document is used.
 
-        line = line.lstrip()
+    Raises ``KeyError`` if ``path`` is not present.
+    """
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+    if not hasattr(fp, 'readline'):
+        raise TypeError("Expected fp to be a file-like object supporting line iteration")
+    if isinstance(path, string_type):
+        raise TypeError("Expected path to be a sequence of keys, got %s" % type(path))
 
-        # skip empty and comment lines
-        if line == "" or line[0] == '/':
+    parts = [part.lower() for part in path] if case_insensitive else list(path)
+    last = len(parts)
+    stack = [mapper()]
+    skip = 0
+
+    for kind, key, val, _, _ in _iter_tokens(_read_buffer(fp), _fp_name(fp)):
+        # inside a block that is not on the path
+        if skip:
+            if kind == TOKEN_OPEN:
+                skip += 1
+            elif kind == TOKEN_CLOSE:
+                skip -= 1
             continue
 
-        # one level deeper
-        if line[0] == "{":
-            expect_bracket = False
+        if kind == TOKEN_CLOSE:
+            stack.pop()
             continue
 
-        if expect_bracket:
-            raise SyntaxError("vdf.parse: expected openning bracket",
-                              (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 1, line))
+        if escaped:
+            key = _unescape(key)
 
-        # one level back
-        if line[0] == "}":
-            if len(stack) > 1:
-                stack.pop()
-                continue
+        level = len(stack) - 1
+        if level < last and (key.lower() if case_insensitive else key) != parts[level]:
+            if kind == TOKEN_OPEN:
+                skip = 1
+            continue
 
-            raise SyntaxError("vdf.parse: one too many closing parenthasis",
-                              (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 0, line))
+        if kind == TOKEN_VALUE:
+            stack[-1][key] = _unescape(val) if escaped else val
+        else:
+            stack.append(_open_block(stack[-1], key, mapper, merge_duplicate_keys))
 
-        # parse keyvalue pairs
-        while True:
-            match = re_keyvalue.match(line)
+    node = stack[0]
+    for part in parts:
+        if not isinstance(node, Mapping):
+            raise KeyError(path)
+        if case_insensitive:
+            part = next((k for k in node.keys() if k.lower() == part), None)
+        if part is None or part not in node:
+            raise KeyError(path)
+        node = node[part]
 
-            if not match:
-                try:
-                    line += next(fp)
-                    continue
-                except StopIteration:
-                    raise SyntaxError("vdf.parse: unexpected EOF (open key quote?)",
-                                      (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 0, line))
-
-            key = match.group('key') if match.group('qkey') is None else match.group('qkey')
-            val = match.group('qval')
-            if val is None:
-                val = match.group('val')
-                if val is not None:
-                    val = val.rstrip()
-                    if val == "":
-                        val = None
+    return node
 
-            if escaped:
-                key = _unescape(key)
 
-            # we have a key with value in parenthesis, so we make a new dict obj (level deeper)
-            if val is None:
-                if merge_duplicate_keys and key in stack[-1]:
-                    _m = stack[-1][key]
-                    # we've descended a level deeper, if value is str, we have to overwrite it to mapper
-                    if not isinstance(_m, mapper):
-                        _m = stack[-1][key] = mapper()
-                else:
-                    _m = mapper()
-                    stack[-1][key] = _m
+def patches(s, path, values, case_insensitive=False, escaped=True):
+    """
+    Set ``values`` (a ``dict`` of key/value pairs) inside the block at ``path`` of
+    ``s`` (a ``str`` containing a VDF) and return the patched ``str``.
 
-                if match.group('eblock') is None:
-                    # only expect a bracket if it's not already closed or on the same line
-                    stack.append(_m)
-                    if match.group('sblock') is None:
-                        expect_bracket = True
+    Only the spans of the values being replaced are rewritten, the rest of the
+    document is kept byte-identical. Keys that are not present are inserted at the
+    end of the block, and missing blocks along ``path`` are created. Inserted lines use
+    the document's line ending, taken from its first line.
 
-            # we've matched a simple keyvalue pair, map it to the last dict obj in the stack
-            else:
-                # if the value is line consume one more line and try to match again,
-                # until we get the KeyValue pair
-                if match.group('vq_end') is None and match.group('qval') is not None:
-                    try:
-                        line += next(fp)
-                        continue
-                    except StopIteration:
-                        raise SyntaxError("vdf.parse: unexpected EOF (open quote for value?)",
-                                          (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 0, line))
+    ``case_insensitive`` when ``True`` will match both the keys in ``path`` and
+    in ``values`` ignoring case.
+    """
+    if not isinstance(s, string_type):
+        raise TypeError("Expected s to be a str, got %s" % type(s))
+    if isinstance(path, string_type):
+        raise TypeError("Expected path to be a sequence of keys, got %s" % type(path))
+    if not isinstance(values, Mapping):
+        raise TypeError("Expected values to be an instance of``dict``")
+
+    fold = (lambda key: key.lower()) if case_insensitive else (lambda key: key)
+
+    def quote(text):
+        if escaped and isinstance(text, string_type):
+            text = _escape(text)
+        return '"%s"' % text
+
+    path = list(path)
+    parts = [fold(part) for part in path]
+    target = len(parts)
+    keys = dict((fold(key), key) for key in values)
+    found = set()
+    edits = []
+
+    closes = [None] * (target + 1)  # last closing bracket seen for each level on the path
+    indent = None                   # indentation of the last child seen in the target block
+    matched = 0
+    skip = 0
+
+    for kind, key, val, start, end in _iter_tokens(s):
+        if skip:
+            if kind == TOKEN_OPEN:
+                skip += 1
+            elif kind == TOKEN_CLOSE:
+                skip -= 1
+            continue
 
-                stack[-1][key] = _unescape(val) if escaped else val
+        if kind == TOKEN_CLOSE:
+            closes[matched] = start
+            matched -= 1
+            continue
 
-            # exit the loop
-            break
+        if matched == target:
+            indent = _re_indent.match(s, s.rfind('\n', 0, start) + 1).group()
 
-    if len(stack) != 1:
-        raise SyntaxError("vdf.parse: unclosed parenthasis or quotes (EOF)",
-                           (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 0, line))
+        key = fold(_unescape(key) if escaped else key)
 
-    return stack.pop()
+        if kind == TOKEN_OPEN:
+            if matched < target and key == parts[matched]:
+                matched += 1
+            else:
+                skip = 1
+        elif matched == target and key in keys:
+            found.add(key)
+            edits.append((start, end, quote(values[keys[key]])))
+
+    missing = [key for key in values if fold(key) not in found]
+    if missing:
+        eol = s.find('\n')
+        nl = '\r\n' if eol > 0 and s[eol - 1] == '\r' else '\n'
+
+        # insert into the last occurrence of the deepest block on the path
+        level = target
+        while level and closes[level] is None:
+            level -= 1
+
+        if level == 0:
+            pos = len(s)
+            base = ''
+            prefix = nl if s and not s.endswith('\n') else ''
+            suffix = ''
+        else:
+            pos = closes[level]
+            line_start = s.rfind('\n', 0, pos) + 1
+            base = _re_indent.match(s, line_start).group()
+            if line_start + len(base) == pos:
+                # closing bracket on its own line, insert the lines above it
+                pos = line_start
+                prefix = suffix = ''
+            else:
+                # block closed on the same line, e.g. "Steam" {}
+                prefix = nl
+                suffix = base
+            if level < target or indent is None:
+                indent = base + '\t'
+            base = indent
+
+        lines = []
+        for i, part in enumerate(path[level:]):
+            lines.append('%s%s%s%s{%s' % (base + '\t' * i, quote(part), nl, base + '\t' * i, nl))
+        inner = base + '\t' * (target - level)
+        for key in missing:
+            lines.append('%s%s\t\t%s%s' % (inner, quote(key), quote(values[key]), nl))
+        for i in reversed(range(target - level)):
+            lines.append('%s}%s' % (base + '\t' * i, nl))
+
+        edits.append((pos, pos, prefix + ''.join(lines) + suffix))
+
+    edits.sort(key=lambda edit: edit[0])
+    chunks = []
+    pos = 0
+    for start, end, text in edits:
+        chunks.append(s[pos:start])
+        chunks.append(text)
+        pos = end
+    chunks.append(s[pos:])
+
+    return ''.join(chunks)
 
 
 def loads(s, **kwargs):
@@ -195,12 +463,12 @@ def loads(s, **kwargs):
     if not isinstance(s, string_type):
         raise TypeError("Expected s to be a str, got %s" % type(s))
 
-    try:
-        fp = unicodeIO(s)
-    except TypeError:
-        fp = strIO(s)
+    mapper = kwargs.get('mapper', dict)
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
 
-    return parse(fp, **kwargs)
+    # parse the string as it is, a StringIO copy of it would double the peak memory
+    return _parse_buffer(s, '<StringIO>', **kwargs)
 
 
 def load(fp, **kwargs):
@@ -211,6 +479,42 @@ def load(fp, **kwargs):
     return parse(fp, **kwargs)
 
 
+def iterparse(fp, escaped=True):
+    """
+    Iterate over ``fp`` (a ``.readline()``-supporting file-like object containing
+    a VDF) without building a tree.
+
+    Yields ``(event, key, value, depth)`` tuples, where ``event`` is one of:
+
+    - ``'start'``: a block named ``key`` was opened, ``value`` is ``None``
+    - ``'value'``: a ``key`` / ``value`` pair
+    - ``'end'``: the block named ``key`` was closed, ``value`` is ``None``
+
+    ``depth`` is ``0`` for top level keys, and the same for the ``'start'`` and
+    ``'end'`` events of a block. The caller can stop iterating at any point.
+    ``SyntaxError`` is raised when the error is reached, like ``parse`` does.
+    """
+    if not hasattr(fp, 'readline'):
+        raise TypeError("Expected fp to be a file-like object supporting line iteration")
+
+    keys = []
+
+    for kind, key, val, _, _ in _iter_tokens(_read_buffer(fp), _fp_name(fp)):
+        if kind == TOKEN_CLOSE:
+            key = keys.pop()
+            yield 'end', key, None, len(keys)
+            continue
+
+        if escaped:
+            key = _unescape(key)
+
+        if kind == TOKEN_VALUE:
+            yield 'value', key, _unescape(val) if escaped else val, len(keys)
+        else:
+            yield 'start', key, None, len(keys)
+            keys.append(key)
+
+
 def dumps(obj, pretty=False, escaped=True):
     """
     Serialize ``obj`` to a VDF formatted ``str``.
@@ -222,7 +526,7 @@ def dumps(obj, pretty=False, escaped=True):
     if not isinstance(escaped, bool):
         raise TypeError("Expected escaped to be of type bool")
 
-    return ''.join(_dump_gen(obj, pretty, escaped))
+    return ''.join(_dump_parts(obj, pretty, escaped))
 
 
 def dump(obj, fp, pretty=False, escaped=True):
@@ -239,31 +543,54 @@ def dump(obj, fp, pretty=False, escaped=True):
     if not isinstance(escaped, bool):
         raise TypeError("Expected escaped to be of type bool")
 
-    for chunk in _dump_gen(obj, pretty, escaped):
-        fp.write(chunk)
-
+    fp.write(''.join(_dump_parts(obj, pretty, escaped)))
 
-def _dump_gen(data, pretty=False, escaped=True, level=0):
-    indent = "\t"
-    line_indent = ""
 
-    if pretty:
-        line_indent = indent * level
-
-    for key, value in data.items():
-        if escaped and isinstance(key, string_type):
-            key = _escape(key)
+def _dump_parts(data, pretty=False, escaped=True):
+    """
+    Serialize ``data`` into a list of ``str`` parts, one per line.
+    Nested mappings are walked with an explicit stack instead of recursion.
+    """
+    parts = []
+    append = parts.append
+    needs_escape = _re_escape.search if escaped else None
+    indents = ['']
+    line_indent = ''
+    stack = [iter(data.items())]
+
+    while stack:
+        for key, value in stack[-1]:
+            if not isinstance(key, string_type):
+                key = '%s' % (key,)
+            elif escaped and needs_escape(key):
+                key = _escape(key)
+
+            # strings are by far the most common values, check them first
+            if isinstance(value, string_type):
+                if escaped and needs_escape(value):
+                    value = _escape(value)
+            elif isinstance(value, Mapping):
+                append(line_indent + '"' + key + '"\n' + line_indent + '{\n')
+                stack.append(iter(value.items()))
+
+                if pretty:
+                    if len(stack) > len(indents):
+                        indents.append('\t' * len(indents))
+                    line_indent = indents[len(stack) - 1]
+                break
+            else:
+                value = '%s' % (value,)
 
-        if isinstance(value, Mapping):
-            yield '%s"%s"\n%s{\n' % (line_indent, key, line_indent)
-            for chunk in _dump_gen(value, pretty, escaped, level+1):
-                yield chunk
-            yield "%s}\n" % line_indent
+            append(line_indent + '"' + key + '" "' + value + '"\n')
         else:
-            if escaped and isinstance(value, string_type):
-                value = _escape(value)
+            stack.pop()
+
+            if stack:
+                if pretty:
+                    line_indent = indents[len(stack) - 1]
+                append(line_indent + '}\n')
 
-            yield '%s"%s" "%s"\n' % (line_indent, key, value)
+    return parts
 
 
 # binary VDF
@@ -295,6 +622,11 @@ BIN_END         = b'\x08'
 BIN_INT64       = b'\x0A'
 BIN_END_ALT     = b'\x0B'
 
+_int32 = struct.Struct('<i')
+_uint64 = struct.Struct('<Q')
+_int64 = struct.Struct('<q')
+_float32 = struct.Struct('<f')
+
 def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=True):
     """
     Deserialize ``b`` (``bytes`` containing a VDF in "binary form")
@@ -310,8 +642,15 @@ def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, ra
     """
     if not isinstance(b, bytes):
         raise TypeError("Expected s to be bytes, got %s" % type(b))
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    result, end = _binary_decode(b, 0, mapper, merge_duplicate_keys, alt_format)
 
-    return binary_load(BytesIO(b), mapper, merge_duplicate_keys, alt_format, raise_on_remaining)
+    if raise_on_remaining and end < len(b):
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (end - 1))
+
+    return result
 
 def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=False):
     """
@@ -325,101 +664,575 @@ def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, ra
     ``merge_duplicate_keys`` when ``True`` will merge multiple KeyValue lists with the
     same key into one instead of overwriting. You can se this to ``False`` if you are
     using ``VDFDict`` and need to preserve the duplicates.
+
+    Small objects are read in growing chunks; once an object outgrows
+    ``_BINARY_MMAP_THRESHOLD`` and ``fp`` is a real file, the file is memory-mapped and
+    decoded in place instead. Only about as much as the object needs is read, and
+    afterwards ``fp`` is positioned right after the end of the binary VDF, ready for
+    the next one.
     """
     if not hasattr(fp, 'read') or not hasattr(fp, 'tell') or not hasattr(fp, 'seek'):
         raise TypeError("Expected fp to be a file-like object with tell()/seek() and read() returning bytes")
     if not issubclass(mapper, Mapping):
         raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
 
-    # helpers
-    int32 = struct.Struct('<i')
-    uint64 = struct.Struct('<Q')
-    int64 = struct.Struct('<q')
-    float32 = struct.Struct('<f')
+    start = fp.tell()
+    result, end = _binary_decode_stream(fp, start, mapper, merge_duplicate_keys, alt_format)
+    fp.seek(end)
 
-    def read_string(fp, wide=False):
-        buf, end = b'', -1
-        offset = fp.tell()
+    if raise_on_remaining:
+        if fp.read(1):
+            raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (end - 1))
+        fp.seek(end)
 
-        # locate string end
-        while end == -1:
-            chunk = fp.read(64)
+    return result
+
+# first read size for binary_load(), doubled until the object fits
+_BINARY_CHUNK_SIZE = 4096
+# objects larger than this are decoded from a mmap of the file, when there is one
+_BINARY_MMAP_THRESHOLD = 1 << 16
+
+def _binary_map_fp(fp):
+    """ Returns a read-only ``mmap`` of the file behind ``fp``, or ``None`` """
+    try:
+        fileno = fp.fileno()
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
 
-            if chunk == b'':
-                raise SyntaxError("Unterminated cstring (offset: %d)" % offset)
+    if hasattr(fp, 'flush'):
+        try:
+            fp.flush()
+        except (IOError, OSError, ValueError):
+            pass
 
+    try:
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError):
+        # pipes, sockets and empty files can't be mapped
+        return None
+
+def _binary_decode_stream(fp, start, mapper, merge_duplicate_keys, alt_format):
+    """
+    Decode one binary VDF from ``fp`` at ``start``.
+    Returns the decoded object and the file position right after it.
+    """
+    size = _BINARY_CHUNK_SIZE
+    buf = b''
+
+    while True:
+        if size > _BINARY_MMAP_THRESHOLD:
+            mapped = _binary_map_fp(fp)
+            if mapped is not None:
+                try:
+                    return _binary_decode(mapped, start, mapper, merge_duplicate_keys, alt_format)
+                finally:
+                    mapped.close()
+
+        chunk = fp.read(size - len(buf))
+        if chunk:
             buf += chunk
-            end = buf.find(b'\x00\x00' if wide else b'\x00')
+        eof = len(buf) < size
 
-        if wide:
-            end += end % 2
+        try:
+            result, end = _binary_decode(buf, 0, mapper, merge_duplicate_keys, alt_format, start)
+        except (SyntaxError, struct.error, UnicodeDecodeError):
+            if eof:
+                raise
+        else:
+            # stopping exactly at the end of the chunk may mean the data was cut short
+            if eof or end < len(buf):
+                return result, start + end
+
+        size *= 2
 
-        # rewind fp
-        fp.seek(end - len(buf) + (2 if wide else 1), 1)
+def _binary_read_string(buf, pos, wide=False, offset=0):
+    """
+    Read a NUL terminated string at ``pos`` of ``buf``.
+    Returns the decoded string and the position after the terminator.
+    """
+    end = buf.find(b'\x00\x00' if wide else b'\x00', pos)
 
-        # decode string
-        result = buf[:end]
+    if end == -1:
+        raise SyntaxError("Unterminated cstring (offset: %d)" % (offset + pos))
 
-        if wide:
-            result = result.decode('utf-16')
-        elif bytes is not str:
+    if wide:
+        end += (end - pos) % 2
+        return buf[pos:end].decode('utf-16'), end + 2
+
+    result = buf[pos:end]
+
+    if bytes is not str:
+        result = result.decode('utf-8', 'replace')
+    else:
+        try:
+            result.decode('ascii')
+        except:
             result = result.decode('utf-8', 'replace')
-        else:
-            try:
-                result.decode('ascii')
-            except:
-                result = result.decode('utf-8', 'replace')
 
-        return result
+    return result, end + 1
 
-    stack = [mapper()]
+def _binary_decode(buf, pos, mapper=dict, merge_duplicate_keys=True, alt_format=False, offset=0, root=None):
+    """
+    Decode binary VDF from ``buf`` (``bytes`` or ``mmap``) starting at ``pos``.
+    ``offset`` is only added to the positions reported in errors.
+    When ``root`` is given, the keys are decoded into it instead of a new ``mapper()``.
+
+    Returns the decoded object and the position right after it.
+    """
+    read_string = _binary_read_string
+    find = buf.find
+    py3 = bytes is not str
+    buf_len = len(buf)
+    current = mapper() if root is None else root
+    stack = [current]
     CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
 
-    for t in iter(lambda: fp.read(1), b''):
+    while pos < buf_len:
+        t = buf[pos:pos + 1]
+        pos += 1
+
         if t == CURRENT_BIN_END:
             if len(stack) > 1:
                 stack.pop()
+                current = stack[-1]
                 continue
             break
 
-        key = read_string(fp)
+        key, pos = read_string(buf, pos, False, offset)
 
-        if t == BIN_NONE:
-            if merge_duplicate_keys and key in stack[-1]:
-                _m = stack[-1][key]
+        if t == BIN_STRING:
+            end = find(b'\x00', pos)
+            if end == -1 or not py3:
+                current[key], pos = read_string(buf, pos, False, offset)
             else:
-                _m = mapper()
-                stack[-1][key] = _m
-            stack.append(_m)
-        elif t == BIN_STRING:
-            stack[-1][key] = read_string(fp)
-        elif t == BIN_WIDESTRING:
-            stack[-1][key] = read_string(fp, wide=True)
-        elif t in (BIN_INT32, BIN_POINTER, BIN_COLOR):
-            val = int32.unpack(fp.read(int32.size))[0]
-
-            if t == BIN_POINTER:
-                val = POINTER(val)
-            elif t == BIN_COLOR:
-                val = COLOR(val)
-
-            stack[-1][key] = val
+                current[key] = buf[pos:end].decode('utf-8', 'replace')
+                pos = end + 1
+        elif t == BIN_NONE:
+            if merge_duplicate_keys and key in current:
+                current = current[key]
+            else:
+                current[key] = current = mapper()
+            stack.append(current)
+        elif t == BIN_INT32:
+            current[key] = _int32.unpack_from(buf, pos)[0]
+            pos += 4
         elif t == BIN_UINT64:
-            stack[-1][key] = UINT_64(uint64.unpack(fp.read(int64.size))[0])
+            current[key] = UINT_64(_uint64.unpack_from(buf, pos)[0])
+            pos += 8
+        elif t == BIN_WIDESTRING:
+            current[key], pos = read_string(buf, pos, True, offset)
+        elif t == BIN_POINTER:
+            current[key] = POINTER(_int32.unpack_from(buf, pos)[0])
+            pos += 4
+        elif t == BIN_COLOR:
+            current[key] = COLOR(_int32.unpack_from(buf, pos)[0])
+            pos += 4
         elif t == BIN_INT64:
-            stack[-1][key] = INT_64(int64.unpack(fp.read(int64.size))[0])
+            current[key] = INT_64(_int64.unpack_from(buf, pos)[0])
+            pos += 8
         elif t == BIN_FLOAT32:
-            stack[-1][key] = float32.unpack(fp.read(float32.size))[0]
+            current[key] = _float32.unpack_from(buf, pos)[0]
+            pos += 4
         else:
-            raise SyntaxError("Unknown data type at offset %d: %s" % (fp.tell() - 1, repr(t)))
+            raise SyntaxError("Unknown data type at offset %d: %s" % (offset + pos - 1, repr(t)))
 
     if len(stack) != 1:
         raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
-    if raise_on_remaining and fp.read(1) != b'':
-        fp.seek(-1, 1)
-        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (fp.tell() - 1))
 
-    return stack.pop()
+    return stack.pop(), pos
+
+# type -> (struct, wrapper) for fixed size values
+_binary_numbers = {
+    BIN_INT32: (_int32, None),
+    BIN_POINTER: (_int32, POINTER),
+    BIN_COLOR: (_int32, COLOR),
+    BIN_UINT64: (_uint64, UINT_64),
+    BIN_INT64: (_int64, INT_64),
+    BIN_FLOAT32: (_float32, None),
+}
+
+_binary_sizes = dict((t, unpacker.size) for t, (unpacker, _) in _binary_numbers.items())
+
+def _binary_value_end(buf, t, pos):
+    """
+    Find where the value of type ``t`` starting at ``pos`` ends.
+    Returns the end of the value and the position of the next entry.
+    """
+    if t == BIN_STRING:
+        end = buf.find(b'\x00', pos)
+        if end == -1:
+            raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+        return end, end + 1
+    elif t == BIN_WIDESTRING:
+        end = buf.find(b'\x00\x00', pos)
+        if end == -1:
+            raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+        end += (end - pos) % 2
+        return end, end + 2
+    elif t in _binary_sizes:
+        end = pos + _binary_sizes[t]
+        if end > len(buf):
+            raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+        return end, end
+
+    raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
+
+def _binary_skip(buf, pos, alt_format=False):
+    """
+    Skip over the nested object starting at ``pos`` without decoding it.
+    Returns the position after its end marker.
+    """
+    find = buf.find
+    sizes = _binary_sizes
+    buf_len = len(buf)
+    depth = 1
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+
+    while pos < buf_len:
+        t = buf[pos:pos + 1]
+        pos += 1
+
+        if t == CURRENT_BIN_END:
+            depth -= 1
+            if depth == 0:
+                return pos
+            continue
+
+        end = find(b'\x00', pos)
+        if end == -1:
+            raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+        pos = end + 1
+
+        if t == BIN_STRING:
+            end = find(b'\x00', pos)
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+            pos = end + 1
+        elif t == BIN_NONE:
+            depth += 1
+        elif t in sizes and pos + sizes[t] <= buf_len:
+            pos += sizes[t]
+        else:
+            pos = _binary_value_end(buf, t, pos)[1]
+
+    raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+class BinaryVDFMap(Mapping):
+    """
+    Read-only mapping over a binary VDF object, see ``binary_open()``.
+
+    Keys of a level are indexed on first access, by skipping over the entries
+    without decoding them. Nested objects are returned as ``BinaryVDFMap`` and
+    values are only decoded when looked up. ``raw()`` returns string values as
+    ``memoryview`` slices of the underlying buffer, without decoding them.
+    """
+    __slots__ = ('_buf', '_spans', '_alt_format', '_merge_duplicate_keys', '_entries')
+
+    def __init__(self, buf, spans, alt_format=False, merge_duplicate_keys=True):
+        self._buf = buf
+        self._spans = spans
+        self._alt_format = alt_format
+        self._merge_duplicate_keys = merge_duplicate_keys
+        self._entries = None
+
+    def _index(self):
+        if self._entries is not None:
+            return self._entries
+
+        buf = self._buf
+        buf_len = len(buf)
+        entries = {}
+        CURRENT_BIN_END = BIN_END if not self._alt_format else BIN_END_ALT
+
+        # duplicate keys may spread the same object over several spans
+        for pos in self._spans:
+            while pos < buf_len:
+                t = buf[pos:pos + 1]
+                pos += 1
+
+                if t == CURRENT_BIN_END:
+                    break
+
+                key, pos = _binary_read_string(buf, pos)
+
+                if t == BIN_NONE:
+                    existing = entries.get(key) if self._merge_duplicate_keys else None
+
+                    if isinstance(existing, BinaryVDFMap):
+                        existing._spans.append(pos)
+                    elif existing is not None:
+                        # like binary_load(), an empty object leaves the value alone
+                        if buf[pos:pos + 1] != CURRENT_BIN_END:
+                            raise TypeError("Can't merge object %r into a value" % key)
+                    else:
+                        entries[key] = BinaryVDFMap(buf, [pos], self._alt_format, self._merge_duplicate_keys)
+                    pos = _binary_skip(buf, pos, self._alt_format)
+                else:
+                    end, next_pos = _binary_value_end(buf, t, pos)
+                    entries[key] = (t, pos, end)
+                    pos = next_pos
+
+        self._entries = entries
+        return entries
+
+    def __getitem__(self, key):
+        entry = self._index()[key]
+
+        if isinstance(entry, BinaryVDFMap):
+            return entry
+
+        t, start, end = entry
+
+        if t == BIN_STRING:
+            return _binary_read_string(self._buf, start)[0]
+        elif t == BIN_WIDESTRING:
+            return self._buf[start:end].decode('utf-16')
+
+        unpacker, wrapper = _binary_numbers[t]
+        value = unpacker.unpack_from(self._buf, start)[0]
+        return wrapper(value) if wrapper else value
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._index())
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
+
+    def raw(self, key):
+        """
+        Return the undecoded bytes of the value for ``key`` as a ``memoryview``.
+        Raises ``TypeError`` when the value is a nested object.
+        """
+        entry = self._index()[key]
+
+        if isinstance(entry, BinaryVDFMap):
+            raise TypeError("%r is a nested object" % key)
+
+        return memoryview(self._buf)[entry[1]:entry[2]]
+
+    def to_dict(self, mapper=dict):
+        """
+        Decode the whole object, returning the same result as ``binary_load()``.
+        """
+        return mapper((key, value.to_dict(mapper) if isinstance(value, BinaryVDFMap) else value)
+                      for key, value in self.items())
+
+def _binary_map(path):
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            return b''
+
+def binary_open(path, alt_format=False, merge_duplicate_keys=True):
+    """
+    Open the binary VDF file at ``path`` and return a lazy ``BinaryVDFMap`` of it.
+
+    The file is memory-mapped, so only the parts that are actually accessed are read
+    and decoded. The mapping stays valid for as long as it, or a value returned
+    from it, is referenced.
+    """
+    return BinaryVDFMap(_binary_map(path), [0], alt_format, merge_duplicate_keys)
+
+def _binary_build_index(buf, alt_format=False):
+    """
+    Walk ``buf`` and record where every nested object is.
+    Returns a ``dict`` of key path tuple -> list of ``(offset, length)``, one per
+    occurrence in file order, where ``offset`` is the first byte after the key.
+
+    When a non-object value has the same key path as an object, it can replace
+    that object, so it is recorded too, as ``(offset, 0)``. Objects always have
+    a length of at least 1.
+    """
+    index, scalar_keys = _binary_walk_index(buf, alt_format)
+
+    # paths that have both objects and other values, usually there are none
+    shadowed = set(p for p in index if p[-1] in scalar_keys.get(p[:-1], ()))
+    if shadowed:
+        _binary_walk_index(buf, alt_format, shadowed, index)
+        for p in shadowed:
+            index[p].sort()
+
+    return index
+
+def _binary_walk_index(buf, alt_format, shadowed=None, index=None):
+    """
+    Without ``shadowed``, returns the index of the objects and a ``dict`` of key path
+    tuple -> keys of the other values found in the objects at that path.
+    With ``shadowed``, only adds the other values at those paths to ``index``.
+    """
+    find = buf.find
+    sizes = _binary_sizes
+    buf_len = len(buf)
+    if index is None:
+        index = {}
+    scalar_keys = {}
+    path = []
+    starts = []
+    # keys of the non-object values of each open object, root first
+    frame = []
+    frames = [frame]
+    pos = 0
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+
+    while pos < buf_len:
+        t = buf[pos:pos + 1]
+        pos += 1
+
+        if t == CURRENT_BIN_END:
+            if not path:
+                break
+            start = starts.pop()
+            if shadowed is None:
+                key_path = tuple(path)
+                index.setdefault(key_path, []).append((start, pos - start))
+                if frame:
+                    scalar_keys.setdefault(key_path, set()).update(frame)
+            frames.pop()
+            frame = frames[-1]
+            path.pop()
+            continue
+
+        key, pos = _binary_read_string(buf, pos)
+
+        if t == BIN_NONE:
+            path.append(key)
+            starts.append(pos)
+            frame = []
+            frames.append(frame)
+            continue
+
+        if shadowed is None:
+            frame.append(key)
+        elif tuple(path) + (key,) in shadowed:
+            index[tuple(path) + (key,)].append((pos, 0))
+
+        if t == BIN_STRING:
+            end = find(b'\x00', pos)
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+            pos = end + 1
+        elif t in sizes and pos + sizes[t] <= buf_len:
+            pos += sizes[t]
+        else:
+            pos = _binary_value_end(buf, t, pos)[1]
+
+    if path:
+        raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+    if frame:
+        scalar_keys.setdefault((), set()).update(frame)
+
+    return index, scalar_keys
+
+# index_path -> (signature, index) of the indexes used in this process
+_binary_index_cache = {}
+
+# bumped when the saved index format changes, so older .idx files get rebuilt
+_BINARY_INDEX_VERSION = 2
+
+_fspath = getattr(os, 'fspath', lambda path: path)
+
+def binary_index(path, alt_format=False, index_path=None):
+    """
+    Return the offset index of the binary VDF file at ``path``. See ``binary_load_path()``.
+
+    The index is saved to ``index_path`` (``path + '.idx'`` by default) together with
+    the file's mtime and size, and is only rebuilt when those change. Failing to save
+    the index is not an error. Loaded indexes are also kept in memory.
+    """
+    path = _fspath(path)
+    index_path = path + '.idx' if index_path is None else _fspath(index_path)
+
+    st = os.stat(path)
+    signature = [st.st_mtime, st.st_size, bool(alt_format), _BINARY_INDEX_VERSION]
+
+    cached = _binary_index_cache.get(index_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(index_path, 'r') as f:
+            saved = json.load(f)
+        if saved['signature'] == signature:
+            index = dict((tuple(key), [tuple(span) for span in spans]) for key, spans in saved['index'])
+            _binary_index_cache[index_path] = (signature, index)
+            return index
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index = _binary_build_index(_binary_map(path), alt_format)
+    _binary_index_cache[index_path] = (signature, index)
+
+    try:
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'signature': signature, 'index': list(index.items())}, f)
+        os.rename(tmp_path, index_path)
+    except (IOError, OSError):
+        pass
+
+    return index
+
+def binary_load_path(path, keys, mapper=dict, merge_duplicate_keys=True, alt_format=False, index_path=None):
+    """
+    Decode only the nested object at ``keys`` (e.g. ``['a', 'b', 'c']``) of the binary
+    VDF file at ``path``.
+
+    The object is located through ``binary_index()``, so after the first call only the
+    bytes of that object are read from the file. Raises ``KeyError`` when there is no
+    nested object at ``keys``, including when a later value with the same key replaced
+    it, so the result is the same as ``binary_load(...)[a][b][c]`` whenever that is a
+    mapping.
+    """
+    if isinstance(keys, string_type):
+        raise TypeError("Expected keys to be a sequence of keys, got %s" % type(keys))
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    keys = tuple(keys)
+    index = binary_index(path, alt_format, index_path)
+
+    if not keys:
+        spans = [(0, os.path.getsize(path))]
+    elif merge_duplicate_keys:
+        spans = index.get(keys)
+        # a non-object value anywhere along the path replaces the merged object
+        for i in range(1, len(keys) + 1):
+            if any(length == 0 for _, length in index.get(keys[:i], ())):
+                spans = None
+                break
+    else:
+        # without merging only the last occurrence counts, at every level
+        spans, parent = None, (0, float('inf'))
+        for i in range(1, len(keys) + 1):
+            inside = [span for span in index.get(keys[:i], ())
+                      if parent[0] <= span[0] < parent[0] + parent[1]]
+            if not inside:
+                spans = None
+                break
+            parent = inside[-1]
+            if parent[1] == 0:
+                # the last one is not an object
+                spans = None
+                break
+            spans = [parent]
+
+    if not spans:
+        raise KeyError(keys)
+
+    result = mapper()
+
+    with open(path, 'rb') as f:
+        for offset, length in spans:
+            f.seek(offset)
+            _binary_decode(f.read(length), 0, mapper, merge_duplicate_keys, alt_format, offset, root=result)
+
+    return result
 
 def binary_dumps(obj, alt_format=False):
     """
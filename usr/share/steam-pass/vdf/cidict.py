@@ -0,0 +1,102 @@
+import sys
+
+try:
+    from collections.abc import Mapping, MutableMapping, ItemsView, ValuesView
+except ImportError:
+    from collections import Mapping, MutableMapping, ItemsView, ValuesView
+
+if sys.version_info[0] >= 3:
+    _string_type = str
+else:
+    _string_type = basestring
+
+
+def _fold(key):
+    return key.lower() if isinstance(key, _string_type) else key
+
+
+class CaseInsensitiveDict(MutableMapping):
+    """
+    A mapping with case-insensitive string keys, like the ones Steam uses.
+
+    Lookups fold the key once and hit a ``dict``, so they are O(1). The spelling
+    the key was first stored with is kept, and is what iteration returns, so
+    the data can be written back unchanged. Setting an existing key with another
+    spelling updates the value but keeps the original spelling.
+
+    Can be used as ``mapper`` for ``parse()``. With ``merge_duplicate_keys``,
+    blocks whose keys only differ in case are merged, as Steam does.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data=None):
+        # folded key -> (original key, value)
+        self._data = {}
+
+        if data is not None:
+            if isinstance(data, Mapping):
+                data = data.items()
+            for key, value in data:
+                self[key] = value
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, dict(self.items()))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return (entry[0] for entry in self._data.values())
+
+    def __contains__(self, key):
+        return _fold(key) in self._data
+
+    def __getitem__(self, key):
+        return self._data[_fold(key)][1]
+
+    def get(self, key, default=None):
+        entry = self._data.get(_fold(key))
+        return default if entry is None else entry[1]
+
+    def __setitem__(self, key, value):
+        folded = _fold(key)
+        entry = self._data.get(folded)
+        self._data[folded] = (key if entry is None else entry[0], value)
+
+    def __delitem__(self, key):
+        del self._data[_fold(key)]
+
+    def clear(self):
+        self._data.clear()
+
+    def copy(self):
+        result = self.__class__()
+        result._data = self._data.copy()
+        return result
+
+    __copy__ = copy
+
+    def original_key(self, key, default=None):
+        """ Returns the key as it is spelled in the mapping """
+        entry = self._data.get(_fold(key))
+        return default if entry is None else entry[0]
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+
+class _ItemsView(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping._data.values())
+
+
+class _ValuesView(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return (entry[1] for entry in self._mapping._data.values())
@@ -0,0 +1,160 @@
+try:
+    from collections.abc import Mapping, MutableMapping, ItemsView, ValuesView
+except ImportError:
+    from collections import Mapping, MutableMapping, ItemsView, ValuesView
+
+try:
+    from sys import intern as _intern
+except ImportError:
+    _intern = intern
+
+# blocks with more keys than this are kept in a plain dict
+COMPACT_MAX_KEYS = 16
+
+# (keys, key) -> keys + (key,), so blocks that get the same keys in the same
+# order end up sharing a single keys tuple
+_key_transitions = {}
+_MAX_TRANSITIONS = 65536
+
+
+def _extend_keys(keys, key):
+    transition = (keys, key)
+    result = _key_transitions.get(transition)
+    if result is None:
+        result = keys + (key,)
+        if len(_key_transitions) < _MAX_TRANSITIONS:
+            _key_transitions[transition] = result
+    return result
+
+
+class CompactDict(MutableMapping):
+    """
+    A memory efficient mapping, meant to be used as ``mapper`` for ``parse()``
+    and ``binary_load()``.
+
+    Small blocks are stored as a keys tuple and a values tuple, instead of a hash
+    table. Keys are interned and blocks with the same keys in the same order share
+    the keys tuple. Once a block has more than ``COMPACT_MAX_KEYS`` keys it
+    switches to a ``dict``, so large blocks keep O(1) lookups.
+
+    Key order is preserved, like ``dict``.
+    """
+    __slots__ = ('_keys', '_values')
+
+    def __init__(self, data=None):
+        # _keys is None once the block switched to a dict in _values
+        self._keys = ()
+        self._values = ()
+
+        if data is not None:
+            if isinstance(data, Mapping):
+                data = data.items()
+            for key, value in data:
+                self[key] = value
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, dict(self.items()))
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values if self._keys is None else self._keys)
+
+    def __contains__(self, key):
+        return key in (self._values if self._keys is None else self._keys)
+
+    def __getitem__(self, key):
+        keys = self._keys
+        if keys is None:
+            return self._values[key]
+        try:
+            return self._values[keys.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        keys = self._keys
+        if keys is None:
+            return self._values.get(key, default)
+        if key in keys:
+            return self._values[keys.index(key)]
+        return default
+
+    def __setitem__(self, key, value):
+        if type(key) is str:
+            key = _intern(key)
+
+        keys = self._keys
+        if keys is None:
+            self._values[key] = value
+            return
+
+        try:
+            idx = keys.index(key)
+        except ValueError:
+            if len(keys) < COMPACT_MAX_KEYS:
+                self._keys = _extend_keys(keys, key)
+                self._values += (value,)
+            else:
+                values = dict(zip(keys, self._values))
+                values[key] = value
+                self._keys, self._values = None, values
+        else:
+            values = self._values
+            self._values = values[:idx] + (value,) + values[idx + 1:]
+
+    def __delitem__(self, key):
+        keys = self._keys
+        if keys is None:
+            del self._values[key]
+            return
+
+        try:
+            idx = keys.index(key)
+        except ValueError:
+            raise KeyError(key)
+
+        values = self._values
+        self._keys = keys[:idx] + keys[idx + 1:]
+        self._values = values[:idx] + values[idx + 1:]
+
+    def clear(self):
+        self._keys = ()
+        self._values = ()
+
+    def copy(self):
+        result = self.__class__()
+        result._keys = self._keys
+        result._values = self._values.copy() if self._keys is None else self._values
+        return result
+
+    __copy__ = copy
+
+    def items(self):
+        if self._keys is None:
+            return self._values.items()
+        return _ItemsView(self)
+
+    def values(self):
+        if self._keys is None:
+            return self._values.values()
+        return _ValuesView(self)
+
+
+class _ItemsView(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        mapping = self._mapping
+        if mapping._keys is None:
+            return iter(mapping._values.items())
+        return iter(zip(mapping._keys, mapping._values))
+
+
+class _ValuesView(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        values = self._mapping._values
+        return iter(values.values() if self._mapping._keys is None else values)
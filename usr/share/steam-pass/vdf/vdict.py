@@ -1,9 +1,7 @@
 import sys
-from collections import Counter
 
 if sys.version_info[0] >= 3:
     _iter_values = 'values'
-    _range = range
     _string_type = str
     import collections.abc as _c
     class _kView(_c.KeysView):
@@ -17,13 +15,16 @@ if sys.version_info[0] >= 3:
             return self._mapping.iteritems()
 else:
     _iter_values = 'itervalues'
-    _range = xrange
     _string_type = basestring
     _kView = lambda x: list(x.iterkeys())
     _vView = lambda x: list(x.itervalues())
     _iView = lambda x: list(x.iteritems())
 
 
+# entries are [key, value, position in __omap]
+_KEY, _VALUE, _POS = 0, 1, 2
+
+
 class VDFDict(dict):
     def __init__(self, data=None):
         """
@@ -37,21 +38,41 @@ class VDFDict(dict):
 
         When the ``key`` is ``str``, instead of tuple, set will create a duplicate and get will look up ``(0, key)``
         """
+        # __omap holds every entry in insert order, deleted entries are left as ``None``
+        # until enough of them pile up. The underlying ``dict`` maps each key to its live
+        # entries, in order, so it is only empty when the VDFDict is. C code that looks
+        # at the dict size directly (e.g. ``json``) then goes on to use ``items()``.
         self.__omap = []
-        self.__kcount = Counter()
+        self.__deleted = 0
 
         if data is not None:
             if not isinstance(data, (list, dict)):
                 raise ValueError("Expected data to be list of pairs or dict, got %s" % type(data))
             self.update(data)
 
+    def copy(self):
+        return self.__class__(list(self.iteritems()))
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        from copy import deepcopy
+        result = self.__class__()
+        memo[id(self)] = result
+        for key, value in self.iteritems():
+            result[deepcopy(key, memo)] = deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        return self.__class__, (list(self.iteritems()),)
+
     def __repr__(self):
         out = "%s(" % self.__class__.__name__
         out += "%s)" % repr(list(self.iteritems()))
         return out
 
     def __len__(self):
-        return len(self.__omap)
+        return len(self.__omap) - self.__deleted
 
     def _verify_key_tuple(self, key):
         if len(key) != 2:
@@ -70,57 +91,65 @@ class VDFDict(dict):
             raise TypeError("Expected key to be a str or tuple, got %s" % type(key))
         return key
 
+    def __entries_for(self, key):
+        """ Returns the live entries for ``key`` and the index of the one it points to """
+        idx, skey = key
+        entries = dict.get(self, skey)
+        if entries is None or not 0 <= idx < len(entries):
+            raise KeyError(key)
+        return entries, idx
+
+    def __compact(self):
+        self.__omap = [entry for entry in self.__omap if entry is not None]
+        for pos, entry in enumerate(self.__omap):
+            entry[_POS] = pos
+        self.__deleted = 0
+
     def __setitem__(self, key, value):
         if isinstance(key, _string_type):
-            key = (self.__kcount[key], key)
-            self.__omap.append(key)
+            entry = [key, value, len(self.__omap)]
+            self.__omap.append(entry)
+            entries = dict.get(self, key)
+            if entries is None:
+                dict.__setitem__(self, key, [entry])
+            else:
+                entries.append(entry)
         elif isinstance(key, tuple):
             self._verify_key_tuple(key)
-            if key not in self:
+            try:
+                entries, idx = self.__entries_for(key)
+            except KeyError:
                 raise KeyError("%s doesn't exist" % repr(key))
+            entries[idx][_VALUE] = value
         else:
             raise TypeError("Expected either a str or tuple for key")
-        super(VDFDict, self).__setitem__(key, value)
-        self.__kcount[key[1]] += 1
 
     def __getitem__(self, key):
-        return super(VDFDict, self).__getitem__(self._normalize_key(key))
+        entries, idx = self.__entries_for(self._normalize_key(key))
+        return entries[idx][_VALUE]
 
     def __delitem__(self, key):
         key = self._normalize_key(key)
-        result = super(VDFDict, self).__delitem__(key)
-
-        start_idx = self.__omap.index(key)
-        del self.__omap[start_idx]
+        entries, idx = self.__entries_for(key)
 
-        dup_idx, skey = key
-        self.__kcount[skey] -= 1
-        tail_count = self.__kcount[skey] - dup_idx
+        # later duplicates move down one index, as they would in a list
+        entry = entries.pop(idx)
+        if not entries:
+            dict.__delitem__(self, key[1])
 
-        if tail_count > 0:
-            for idx in _range(start_idx, len(self.__omap)):
-                if self.__omap[idx][1] == skey:
-                    oldkey = self.__omap[idx]
-                    newkey = (dup_idx, skey)
-                    super(VDFDict, self).__setitem__(newkey, self[oldkey])
-                    super(VDFDict, self).__delitem__(oldkey)
-                    self.__omap[idx] = newkey
+        self.__omap[entry[_POS]] = None
+        self.__deleted += 1
 
-                    dup_idx += 1
-                    tail_count -= 1
-                    if tail_count == 0:
-                        break
-
-        if self.__kcount[skey] == 0:
-            del self.__kcount[skey]
-
-        return result
+        # compact once at least half of __omap is deleted entries, amortized O(1)
+        if self.__deleted > 16 and self.__deleted * 2 > len(self.__omap):
+            self.__compact()
 
     def __iter__(self):
         return iter(self.iterkeys())
 
     def __contains__(self, key):
-        return super(VDFDict, self).__contains__(self._normalize_key(key))
+        idx, skey = self._normalize_key(key)
+        return 0 <= idx < len(dict.get(self, skey, ()))
 
     def __eq__(self, other):
         if isinstance(other, VDFDict):
@@ -132,12 +161,15 @@ class VDFDict(dict):
         return not self.__eq__(other)
 
     def clear(self):
-        super(VDFDict, self).clear()
-        self.__kcount.clear()
         self.__omap = list()
+        dict.clear(self)
+        self.__deleted = 0
 
     def get(self, key, *args):
-        return super(VDFDict, self).get(self._normalize_key(key), *args)
+        key = self._normalize_key(key)
+        if key in self:
+            return self[key]
+        return args[0] if args else None
 
     def setdefault(self, key, default=None):
         if key not in self:
@@ -151,10 +183,15 @@ class VDFDict(dict):
         return value
 
     def popitem(self):
-        if not self.__omap:
+        omap = self.__omap
+        while omap and omap[-1] is None:
+            omap.pop()
+            self.__deleted -= 1
+        if not omap:
             raise KeyError("VDFDict is empty")
-        key = self.__omap[-1]
-        return key[1], self.pop(key)
+        skey = omap[-1][_KEY]
+        # the newest entry is also the last duplicate of its key
+        return skey, self.pop((len(dict.__getitem__(self, skey)) - 1, skey))
 
     def update(self, data=None, **kwargs):
         if isinstance(data, dict):
@@ -166,19 +203,19 @@ class VDFDict(dict):
             self.__setitem__(key, value)
 
     def iterkeys(self):
-        return (key[1] for key in self.__omap)
+        return (entry[_KEY] for entry in self.__omap if entry is not None)
 
     def keys(self):
         return _kView(self)
 
     def itervalues(self):
-        return (self[key] for key in self.__omap)
+        return (entry[_VALUE] for entry in self.__omap if entry is not None)
 
     def values(self):
         return _vView(self)
 
     def iteritems(self):
-        return ((key[1], self[key]) for key in self.__omap)
+        return ((entry[_KEY], entry[_VALUE]) for entry in self.__omap if entry is not None)
 
     def items(self):
         return _iView(self)
@@ -187,27 +224,27 @@ class VDFDict(dict):
         """ Returns all values of the given key """
         if not isinstance(key, _string_type):
             raise TypeError("Key needs to be a string.")
-        return [self[(idx, key)] for idx in _range(self.__kcount[key])]
+        return [entry[_VALUE] for entry in dict.get(self, key, ())]
 
     def remove_all_for(self, key):
         """ Removes all items with the given key """
         if not isinstance(key, _string_type):
             raise TypeError("Key need to be a string.")
 
-        for idx in _range(self.__kcount[key]):
-            super(VDFDict, self).__delitem__((idx, key))
-
-        self.__omap = list(filter(lambda x: x[1] != key, self.__omap))
+        for entry in dict.pop(self, key, ()):
+            self.__omap[entry[_POS]] = None
+            self.__deleted += 1
 
-        del self.__kcount[key]
+        if self.__deleted > 16 and self.__deleted * 2 > len(self.__omap):
+            self.__compact()
 
     def has_duplicates(self):
         """
         Returns ``True`` if the dict contains keys with duplicates.
         Recurses through any all keys with value that is ``VDFDict``.
         """
-        for n in getattr(self.__kcount, _iter_values)():
-            if n != 1:
+        for entries in getattr(dict, _iter_values)(self):
+            if len(entries) != 1:
                 return True
 
         def dict_recurse(obj):